@@ -2,12 +2,15 @@
 Matter attribute definitions.
 """
 
-from typing import Dict, Optional, TYPE_CHECKING
+import re
+import sys
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
 
 from ..naming import convert_to_snake_case, escape_rust_keyword
 from ..type_mapping import MatterType
 from .tlv_helpers import (
-    _generate_struct_field_assignments,
+    _struct_decoder_call,
+    _LIST_DECODER_TMPL,
     _generate_list_decoder,
     _generate_single_value_decoder,
 )
@@ -18,6 +21,50 @@ if TYPE_CHECKING:
     from .structs import MatterStruct
 
 
+# Attribute decoder skeletons, rendered with str.format like the list decoder
+# templates in tlv_helpers.
+_DECODE_FN_TMPL = '''/// Decode {name} attribute ({clean_id})
+{attrs}pub fn {func_name}(inp: &tlv::TlvItemValue) -> anyhow::Result<{return_type}> {{
+{decode_logic}
+}}'''
+
+# Thin per-attribute decoder forwarding to a decoder shared by every attribute
+# with the same signature
+_DECODE_WRAPPER_TMPL = '''/// Decode {name} attribute ({clean_id})
+#[inline]
+pub fn {func_name}(inp: &tlv::TlvItemValue) -> anyhow::Result<{return_type}> {{
+    {shared_name}(inp)
+}}'''
+
+# Shared decoder body for one attribute signature
+_SHARED_DECODE_FN_TMPL = '''/// Decode a {description} attribute value
+{attrs}fn {func_name}(inp: &tlv::TlvItemValue) -> anyhow::Result<{return_type}> {{
+{decode_logic}
+}}'''
+
+_NON_IDENT_CHARS = re.compile(r'[^0-9A-Za-z_]+')
+
+# Struct attribute; {decode_call} decodes `inp` in place
+_STRUCT_DECODER_TMPL = '''    if let tlv::TlvItemValue::List(_fields) = inp {{
+        // Struct with fields
+        Ok({decode_call})
+    }} else {{
+        Err(anyhow::anyhow!("Expected struct fields"))
+    }}'''
+
+# Nullable struct attribute; anything but a struct decodes as None
+_NULLABLE_STRUCT_DECODER_TMPL = '''    if let tlv::TlvItemValue::List(_fields) = inp {{
+        // Struct with fields
+        Ok(Some({decode_call}))
+    //}} else if let tlv::TlvItemValue::Null = inp {{
+    //    // Null value for nullable struct
+    //    Ok(None)
+    }} else {{
+    Ok(None)
+    //    Err(anyhow::anyhow!("Expected struct fields or null"))
+    }}'''
+
+
 class AttributeField:
     """Represents a Matter attribute.
 
@@ -25,7 +72,7 @@ class AttributeField:
     and generation methods.
     """
 
-    def __init__(self, hex_id: str, field: MatterField):
+    def __init__(self, hex_id: str, field: MatterField) -> None:
         """
         Initialize an AttributeField.
 
@@ -33,8 +80,12 @@ class AttributeField:
             hex_id: Hex string ID for the attribute (e.g., '0x0000')
             field: MatterField containing the attribute's field data
         """
-        self.hex_id = hex_id
+        self.hex_id = sys.intern(hex_id)
         self._field = field
+        # Memoized get_rust_function_name / get_rust_return_type results; the
+        # latter keyed by the identity of the cluster's definition dicts
+        self._function_name: Optional[str] = None
+        self._return_types: Dict[Tuple[int, int, int], str] = {}
 
     # Delegate properties to the internal MatterField
     @property
@@ -74,15 +125,29 @@ class AttributeField:
 
     def get_rust_function_name(self) -> str:
         """Convert attribute name to snake_case Rust function name."""
-        return f"decode_{escape_rust_keyword(convert_to_snake_case(self.name))}"
+        if self._function_name is None:
+            self._function_name = f"decode_{escape_rust_keyword(convert_to_snake_case(self.name))}"
+        return self._function_name
 
     def get_rust_return_type(self, structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
-        """Get the Rust return type for this attribute."""
+        """Get the Rust return type for this attribute.
+
+        The definition dicts are the same objects for a whole cluster, so the
+        result is memoized per (structs, enums, bitmaps) identity.
+        """
+        key = (id(structs), id(enums), id(bitmaps))
+        return_type = self._return_types.get(key)
+        if return_type is None:
+            return_type = self._return_types[key] = self._compute_rust_return_type(structs, enums, bitmaps)
+        return return_type
+
+    def _compute_rust_return_type(self, structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
+        """Resolve the Rust return type for this attribute."""
         if self.is_list:
             if self.entry_type:
                 # Check if it's a custom struct
-                if structs and self.entry_type in structs:
-                    struct_name = structs[self.entry_type].get_rust_struct_name()
+                if structs and (entry_struct := structs.get(self.entry_type)) is not None:
+                    struct_name = entry_struct.get_rust_struct_name()
                     return f"Vec<{struct_name}>"
                 else:
                     # Map entry types to Rust types
@@ -93,8 +158,8 @@ class AttributeField:
                 return "Vec<String>"
         else:
             # Check if it's a custom struct
-            if structs and self.attr_type in structs:
-                struct_name = structs[self.attr_type].get_rust_struct_name()
+            if structs and (attr_struct := structs.get(self.attr_type)) is not None:
+                struct_name = attr_struct.get_rust_struct_name()
                 if self.nullable:
                     return f"Option<{struct_name}>"
                 return struct_name
@@ -104,91 +169,79 @@ class AttributeField:
                     return f"Option<{rust_type}>"
                 return rust_type
 
-    def generate_decode_function(self, structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
-        """Generate Rust decode function for this attribute."""
-        func_name = self.get_rust_function_name()
-        return_type = self.get_rust_return_type(structs, enums, bitmaps)
-        clean_id = self.id
+    @property
+    def decode_signature(self) -> Tuple[str, bool, Optional[str]]:
+        """Key under which attributes share an identical decoder body."""
+        if self.is_list:
+            return ('list', False, self.entry_type)
+        return (self.attr_type, self.nullable, None)
 
+    def get_shared_decoder_name(self) -> str:
+        """Name of the decoder shared by all attributes with this signature."""
         if self.is_list:
-            if self.entry_type and structs and self.entry_type in structs:
-                # Use custom struct decoder
-                struct = structs[self.entry_type]
-                struct_name = struct.get_rust_struct_name()
-
-                # Generate field assignments
-                field_assignments = _generate_struct_field_assignments(struct.fields, structs, enums, "item", bitmaps)
-                assignments_str = "\n".join(field_assignments)
-
-                decode_logic = f'''    let mut res = Vec::new();
-    if let tlv::TlvItemValue::List(v) = inp {{
-        for item in v {{
-            res.push({struct_name} {{
-{assignments_str}
-            }});
-        }}
-    }}
-    Ok(res)'''
+            entry = convert_to_snake_case(self.entry_type) if self.entry_type else 'string'
+            sig = f"list_of_{entry}"
+        else:
+            sig = convert_to_snake_case(self.attr_type)
+            if self.nullable:
+                sig = f"nullable_{sig}"
+        return f"decode_{_NON_IDENT_CHARS.sub('_', sig)}_attribute_value"
+
+    def _decode_parts(self, structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> Tuple[str, str]:
+        """Return the attribute list and body of this attribute's decoder."""
+        # Scalar decoders are a single match on the value; let callers inline them
+        attrs = ''
+
+        if self.is_list:
+            if self.entry_type and structs and (entry_struct := structs.get(self.entry_type)) is not None:
+                # Use the shared struct decoder
+                decode_call = _struct_decoder_call(entry_struct, "&item.value", structs, enums, bitmaps)
+
+                decode_logic = _LIST_DECODER_TMPL.format(body=f"            res.push({decode_call});")
             elif self.entry_type:
                 # Generate list decoder based on entry type
                 decode_logic = _generate_list_decoder(self.entry_type, enums, bitmaps)
             else:
                 # Generic list decoder
-                decode_logic = '''    let mut res = Vec::new();
-    if let tlv::TlvItemValue::List(v) = inp {
-        for item in v {
-            if let tlv::TlvItemValue::String(s) = &item.value {
-                res.push(s.clone());
-            }
-        }
-    }
-    Ok(res)'''
+                decode_logic = _generate_list_decoder('string')
         else:
-            # Single value decoder
-            # Initialize tlv_type for all paths
-            tlv_type = MatterType.get_tlv_type(self.attr_type, bitmaps=bitmaps)
-
             # Check if this is a custom struct type
-            if structs and self.attr_type in structs:
-                # Handle custom struct decoding
-                struct = structs[self.attr_type]
-                struct_name = struct.get_rust_struct_name()
+            if structs and (attr_struct := structs.get(self.attr_type)) is not None:
+                # Handle custom struct decoding via the shared struct decoder
+                decode_call = _struct_decoder_call(attr_struct, "inp", structs, enums, bitmaps)
 
-                # Generate field assignments for the struct
-                field_assignments = _generate_struct_field_assignments(struct.fields, structs, enums, "item", bitmaps)
-                assignments_str = "\n".join(field_assignments)
-
-                if self.nullable:
-                    # For nullable structs, handle null values and wrap result in Some()
-                    decode_logic = f'''    if let tlv::TlvItemValue::List(_fields) = inp {{
-        // Struct with fields
-        let item = tlv::TlvItem {{ tag: 0, value: inp.clone() }};
-        Ok(Some({struct_name} {{
-{assignments_str}
-        }}))
-    //}} else if let tlv::TlvItemValue::Null = inp {{
-    //    // Null value for nullable struct
-    //    Ok(None)
-    }} else {{
-    Ok(None)
-    //    Err(anyhow::anyhow!("Expected struct fields or null"))
-    }}'''
-                else:
-                    # For non-nullable structs
-                    decode_logic = f'''    if let tlv::TlvItemValue::List(_fields) = inp {{
-        // Struct with fields
-        let item = tlv::TlvItem {{ tag: 0, value: inp.clone() }};
-        Ok({struct_name} {{
-{assignments_str}
-        }})
-    }} else {{
-        Err(anyhow::anyhow!("Expected struct fields"))
-    }}'''
+                template = _NULLABLE_STRUCT_DECODER_TMPL if self.nullable else _STRUCT_DECODER_TMPL
+                decode_logic = template.format(decode_call=decode_call)
             else:
                 # For non-struct types, use unified decoder
                 decode_logic = _generate_single_value_decoder(self.attr_type, self.nullable, enums, bitmaps)
+                attrs = '#[inline]\n'
 
-        return f'''/// Decode {self.name} attribute ({clean_id})
-pub fn {func_name}(inp: &tlv::TlvItemValue) -> anyhow::Result<{return_type}> {{
-{decode_logic}
-}}'''
+        return attrs, decode_logic
+
+    def generate_decode_function(self, structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
+        """Generate Rust decode function for this attribute."""
+        return_type = self.get_rust_return_type(structs, enums, bitmaps)
+        attrs, decode_logic = self._decode_parts(structs, enums, bitmaps)
+        return _DECODE_FN_TMPL.format(name=self.name, clean_id=self.id, attrs=attrs,
+                                      func_name=self.get_rust_function_name(),
+                                      return_type=return_type, decode_logic=decode_logic)
+
+    def generate_shared_decode_function(self, structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
+        """Generate the decoder shared by every attribute with this signature."""
+        return_type = self.get_rust_return_type(structs, enums, bitmaps)
+        attrs, decode_logic = self._decode_parts(structs, enums, bitmaps)
+        if self.is_list:
+            description = f"list of {self.entry_type or 'string'}"
+        else:
+            description = f"nullable {self.attr_type}" if self.nullable else self.attr_type
+        return _SHARED_DECODE_FN_TMPL.format(description=description, attrs=attrs,
+                                             func_name=self.get_shared_decoder_name(),
+                                             return_type=return_type, decode_logic=decode_logic)
+
+    def generate_decode_wrapper(self, structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
+        """Generate a decoder for this attribute that forwards to the shared one."""
+        return _DECODE_WRAPPER_TMPL.format(name=self.name, clean_id=self.id,
+                                           func_name=self.get_rust_function_name(),
+                                           return_type=self.get_rust_return_type(structs, enums, bitmaps),
+                                           shared_name=self.get_shared_decoder_name())
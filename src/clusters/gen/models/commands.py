@@ -2,10 +2,10 @@
 Matter command definitions.
 """
 
-import re
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING, Union
 
 from ..naming import (
+    PASCAL_SPLIT,
     convert_to_snake_case,
     convert_to_pascal_case,
     escape_rust_keyword,
@@ -13,6 +13,7 @@ from ..naming import (
 from ..type_mapping import MatterType
 from .tlv_helpers import (
     _generate_struct_field_assignments,
+    _render_list_value_decoder,
     generate_field_tlv_encoding,
     generate_optional_field_push,
 )
@@ -29,17 +30,78 @@ def _element_to_push(element_str: str) -> str:
     return f"tlv_fields.push({stripped});"
 
 
+# Encoder bodies around the field list: pushes into `tlv_fields` when some
+# fields are truly optional, else a vec![] literal
+_PUSH_FIELDS_HEAD = "\n    let mut tlv_fields: Vec<tlv::TlvItemEnc> = Vec::new();\n    "
+_PUSH_FIELDS_TAIL = '''
+    let tlv = tlv::TlvItemEnc {
+        tag: 0,
+        value: tlv::TlvItemValueEnc::StructInvisible(tlv_fields),
+    };
+    Ok(tlv.encode()?)
+}'''
+_VEC_FIELDS_HEAD = '''
+    let tlv = tlv::TlvItemEnc {
+        tag: 0,
+        value: tlv::TlvItemValueEnc::StructInvisible(vec![
+'''
+_VEC_FIELDS_TAIL = '''
+        ]),
+    };
+    Ok(tlv.encode()?)
+}'''
+
+
+def _definition_suffix(type_name: str) -> str:
+    """Return 'Struct', 'Enum' or 'Bitmap' if type_name names such a definition, else ''."""
+    tail = type_name[-6:]
+    if tail == 'Struct' or tail == 'Bitmap':
+        return tail
+    if tail[-4:] == 'Enum':
+        return 'Enum'
+    return ''
+
+
+def _struct_param_type(type_name: str, structs: Optional[Dict[str, 'MatterStruct']], enums: Optional[Dict[str, 'MatterEnum']], bitmaps: Optional[Dict[str, 'MatterBitmap']]) -> Optional[str]:
+    """Rust type of a struct parameter, or None for a struct from another cluster."""
+    if structs and (struct_def := structs.get(type_name)) is not None:
+        return struct_def.get_rust_struct_name()
+    return None
+
+
+def _enum_param_type(type_name: str, structs: Optional[Dict[str, 'MatterStruct']], enums: Optional[Dict[str, 'MatterEnum']], bitmaps: Optional[Dict[str, 'MatterBitmap']]) -> str:
+    """Rust type of an enum parameter; u8 if the enum is not defined."""
+    if enums and (enum_def := enums.get(type_name)) is not None:
+        return enum_def.get_rust_enum_name()
+    return 'u8'
+
+
+def _bitmap_param_type(type_name: str, structs: Optional[Dict[str, 'MatterStruct']], enums: Optional[Dict[str, 'MatterEnum']], bitmaps: Optional[Dict[str, 'MatterBitmap']]) -> str:
+    """Rust type of a bitmap parameter; u8 if the bitmap is not defined."""
+    if bitmaps and (bitmap_def := bitmaps.get(type_name)) is not None:
+        return bitmap_def.get_rust_bitmap_name()
+    return 'u8'
+
+
+# Parameter type for scalar fields naming a cluster definition, by suffix
+_PARAM_TYPE_HANDLERS = {
+    'Struct': _struct_param_type,
+    'Enum': _enum_param_type,
+    'Bitmap': _bitmap_param_type,
+}
+
+
 class MatterCommand:
     """Represents a Matter command with its fields."""
 
-    def __init__(self, id: str, name: str, direction: str, response_name: Optional[str] = None):
+    def __init__(self, id: str, name: str, direction: str, response_name: Optional[str] = None) -> None:
         self.id = id
         self.name = name
         self.direction = direction
         self.response_name = response_name
         self.fields: List[MatterField] = []
 
-    def add_field(self, field: MatterField):
+    def add_field(self, field: MatterField) -> None:
         """Add a field to this command."""
         self.fields.append(field)
 
@@ -52,7 +114,7 @@ class MatterCommand:
         # Convert command name to PascalCase and append Params
         return f"{convert_to_pascal_case(self.name)}Params"
 
-    def render_params(self, structs: Dict[str, 'MatterStruct'], enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None):
+    def render_params(self, structs: Dict[str, 'MatterStruct'], enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> Tuple[List[Tuple[str, str]], bool, Optional[str]]:
         """Compute the parameter list for this command's encoder signature.
 
         Shared by `generate_rust_function` (emits the encoder) and the typed
@@ -65,40 +127,30 @@ class MatterCommand:
           `params: FooParams` struct instead of positional args
         - param_struct_name: the struct name when use_param_struct, else None
         """
-        param_fields = []
+        param_fields: List[Tuple[str, str]] = []
         for field in self.fields:
             param_name = field.get_rust_param_name()
-            # If this is a list of a custom struct, expose Vec<StructName>
-            if field.is_list and field.entry_type and structs and field.entry_type in structs:
-                item_struct = structs[field.entry_type]
-                rust_type = f"Vec<{item_struct.get_rust_struct_name()}>"
-            elif field.is_list and field.entry_type and field.entry_type.endswith('Struct') and (not structs or field.entry_type not in structs):
-                # Skip list fields that reference undefined structs from other clusters
-                continue
-            elif not field.is_list and field.field_type.endswith('Struct') and structs and field.field_type in structs:
-                # Single struct field
-                struct_def = structs[field.field_type]
-                rust_type = struct_def.get_rust_struct_name()
-            elif not field.is_list and field.field_type.endswith('Struct') and (not structs or field.field_type not in structs):
-                # Skip fields that reference undefined structs from other clusters
-                continue
-            elif not field.is_list and field.field_type.endswith('Enum'):
-                # Check if we have the enum definition
-                if enums and field.field_type in enums:
-                    rust_type = enums[field.field_type].get_rust_enum_name()
-                else:
-                    # Fallback to u8 if enum not defined
-                    rust_type = 'u8'
-            elif not field.is_list and field.field_type.endswith('Bitmap'):
-                # Check if we have the bitmap definition
-                if bitmaps and field.field_type in bitmaps:
-                    rust_type = bitmaps[field.field_type].get_rust_bitmap_name()
+            field_type = field.field_type
+            entry_type = field.entry_type
+            if field.is_list:
+                if entry_type and structs and (item_struct := structs.get(entry_type)) is not None:
+                    # A list of a custom struct exposes Vec<StructName>
+                    rust_type = f"Vec<{item_struct.get_rust_struct_name()}>"
+                elif entry_type and _definition_suffix(entry_type) == 'Struct':
+                    # Skip list fields that reference undefined structs from other clusters
+                    continue
                 else:
-                    # Fallback to u8 if bitmap not defined
-                    rust_type = 'u8'
+                    # MatterType mapping handles primitive lists when is_list=True
+                    rust_type = MatterType.get_rust_type(entry_type or field_type, True, enums=enums, bitmaps=bitmaps)
             else:
-                # Use MatterType mapping (handles primitive lists when is_list=True)
-                rust_type = MatterType.get_rust_type(field.entry_type if field.is_list and field.entry_type else field.field_type, field.is_list, enums=enums, bitmaps=bitmaps)
+                handler = _PARAM_TYPE_HANDLERS.get(_definition_suffix(field_type))
+                if handler is None:
+                    rust_type = MatterType.get_rust_type(field_type, False, enums=enums, bitmaps=bitmaps)
+                else:
+                    rust_type = handler(field_type, structs, enums, bitmaps)
+                    if rust_type is None:
+                        # Skip fields that reference undefined structs from other clusters
+                        continue
 
             # Wrap in Option when nullable or optional. For optional struct/list fields,
             # the encoder will use shadowed `if let Some(name) = name` to reuse the
@@ -131,7 +183,7 @@ class MatterCommand:
         # If any field is truly optional (not mandatory, not nullable) we must use
         # a Vec accumulator body so those fields can be omitted from TLV when absent.
         # Skip cross-cluster struct/list-of-struct fields (they would be `continue`d below).
-        def _is_supported_optional(f):
+        def _is_supported_optional(f: MatterField) -> bool:
             if f.mandatory or f.nullable:
                 return False
             if f.field_type.endswith('Struct') and (not structs or f.field_type not in structs):
@@ -142,9 +194,14 @@ class MatterCommand:
         has_truly_optional = any(_is_supported_optional(f) for f in self.fields)
 
         # Generate TLV encoding - collect both pre-statements and field encodings
-        pre_statements = []  # Statements that need to go before the body
-        tlv_fields = []      # Elements for vec![] (used only when not has_truly_optional)
-        push_statements = [] # Push statements for Vec accumulator (used when has_truly_optional)
+        pre_statements: List[str] = []  # Statements that need to go before the body
+        tlv_fields: List[str] = []      # Elements for vec![] (used only when not has_truly_optional)
+        push_statements: List[str] = [] # Push statements for Vec accumulator (used when has_truly_optional)
+        # Fields referencing other clusters' structs are skipped, so the lists
+        # cannot be presized; bind their growth methods once for the loop
+        add_pre_statements = pre_statements.extend
+        add_tlv_field = tlv_fields.append
+        add_push_statement = push_statements.append
 
         for field in self.fields:
             # Skip fields with undefined cross-cluster struct types (consistent with param generation)
@@ -160,109 +217,71 @@ class MatterCommand:
                     # Truly optional (any type): emit only when Some
                     push_stmt = generate_optional_field_push(field, full_param_name, structs, enums, bitmaps)
                     if push_stmt:
-                        push_statements.append(push_stmt)
+                        add_push_statement(push_stmt)
                 else:
                     # Mandatory or nullable: encode normally, convert element to push call
-                    encoding_result = generate_field_tlv_encoding(field, full_param_name, structs, enums, bitmaps)
-                    if not encoding_result:
+                    field_pre, element = generate_field_tlv_encoding(field, full_param_name, structs, enums, bitmaps)
+                    if not element:
                         continue
-                    # Only split struct-field multi-line results (same guard as the vec![] path).
-                    # List fields also produce multi-line strings but are a single expression.
-                    if '\n' in encoding_result and field.field_type.endswith('Struct'):
-                        lines = encoding_result.split('\n')
-                        pre_statements.extend(lines[:-1])
-                        push_statements.append(_element_to_push(lines[-1]))
-                    else:
-                        push_statements.append(_element_to_push(encoding_result))
+                    # Struct fields build their value in pre-statements first
+                    add_pre_statements(field_pre)
+                    add_push_statement(_element_to_push(element))
             else:
-                encoding_result = generate_field_tlv_encoding(field, full_param_name, structs, enums, bitmaps)
+                field_pre, element = generate_field_tlv_encoding(field, full_param_name, structs, enums, bitmaps)
                 # Skip empty encoding results (from cross-cluster struct skipping)
-                if not encoding_result:
+                if not element:
                     continue
-                # Check if this is a multi-line struct encoding that needs pre-statements
-                if '\n' in encoding_result and field.field_type.endswith('Struct'):
-                    # Split into pre-statements and the final field line
-                    lines = encoding_result.split('\n')
-                    # First line is comment, middle lines are statements, last line is the field push
-                    pre_statements.extend(lines[:-1])  # Everything except last line
-                    tlv_fields.append(lines[-1])  # Last line
-                else:
-                    tlv_fields.append(encoding_result)
+                # Struct fields build their value in pre-statements first
+                add_pre_statements(field_pre)
+                add_tlv_field(element)
 
         # Clean up command ID format
         clean_id = self.id
 
+        # Assemble the function from parts joined once at the end
+        parts = []
+
         # Generate parameter struct if needed
-        struct_def = ""
         if use_param_struct:
-            struct_fields_str = "\n".join([f"    pub {name}: {typ}," for name, typ in param_fields])
-            struct_def = f'''/// Parameters for {self.name} command
-pub struct {struct_name} {{
-{struct_fields_str}
-}}
-
-'''
+            parts.append(f"/// Parameters for {self.name} command\npub struct {struct_name} {{\n")
+            parts.append("\n".join([f"    pub {name}: {typ}," for name, typ in param_fields]))
+            parts.append("\n}\n\n")
 
         # Generate function
+        parts.append(f"/// Encode {self.name} command ({clean_id})\n"
+                     f"pub fn {func_name}({param_str}) -> anyhow::Result<Vec<u8>> {{")
+        for stmt in pre_statements:
+            parts.append("\n    ")
+            parts.append(stmt)
         if has_truly_optional:
-            pre_stmt_str = "\n    ".join(pre_statements) if pre_statements else ""
-            pre_block = f"\n    {pre_stmt_str}" if pre_statements else ""
-            push_stmts_str = "\n    ".join(push_statements) if push_statements else "// No fields"
-            function = f'''{struct_def}/// Encode {self.name} command ({clean_id})
-pub fn {func_name}({param_str}) -> anyhow::Result<Vec<u8>> {{{pre_block}
-    let mut tlv_fields: Vec<tlv::TlvItemEnc> = Vec::new();
-    {push_stmts_str}
-    let tlv = tlv::TlvItemEnc {{
-        tag: 0,
-        value: tlv::TlvItemValueEnc::StructInvisible(tlv_fields),
-    }};
-    Ok(tlv.encode()?)
-}}'''
-        elif pre_statements:
-            pre_stmt_str = "\n    ".join(pre_statements)
-            tlv_fields_str = "\n".join(tlv_fields) if tlv_fields else "        // No fields"
-            function = f'''{struct_def}/// Encode {self.name} command ({clean_id})
-pub fn {func_name}({param_str}) -> anyhow::Result<Vec<u8>> {{
-    {pre_stmt_str}
-    let tlv = tlv::TlvItemEnc {{
-        tag: 0,
-        value: tlv::TlvItemValueEnc::StructInvisible(vec![
-{tlv_fields_str}
-        ]),
-    }};
-    Ok(tlv.encode()?)
-}}'''
+            parts.append(_PUSH_FIELDS_HEAD)
+            parts.append("\n    ".join(push_statements) if push_statements else "// No fields")
+            parts.append(_PUSH_FIELDS_TAIL)
         else:
-            tlv_fields_str = "\n".join(tlv_fields) if tlv_fields else "        // No fields"
-            function = f'''{struct_def}/// Encode {self.name} command ({clean_id})
-pub fn {func_name}({param_str}) -> anyhow::Result<Vec<u8>> {{
-    let tlv = tlv::TlvItemEnc {{
-        tag: 0,
-        value: tlv::TlvItemValueEnc::StructInvisible(vec![
-{tlv_fields_str}
-        ]),
-    }};
-    Ok(tlv.encode()?)
-}}'''
-        return function
+            parts.append(_VEC_FIELDS_HEAD)
+            parts.append("\n".join(tlv_fields) if tlv_fields else "        // No fields")
+            parts.append(_VEC_FIELDS_TAIL)
+        return "".join(parts)
 
 
 class MatterCommandResponse:
     """Represents a Matter command response (responseFromServer)."""
 
-    def __init__(self, id: str, name: str):
+    def __init__(self, id: str, name: str) -> None:
         self.id = id
+        # Command ID without the 0x prefix, as shown in the decoder doc comment
+        self.clean_id = id.replace('0x', '') if id.startswith('0x') else id
         self.name = name
         self.fields: List[MatterField] = []
 
-    def add_field(self, field: MatterField):
+    def add_field(self, field: MatterField) -> None:
         """Add a field to this command response."""
         self.fields.append(field)
 
     def get_rust_struct_name(self) -> str:
         """Convert response name to PascalCase Rust struct name, keeping 'Response' suffix."""
         # Keep the full name including "Response" suffix
-        words = re.findall(r'[A-Z][a-z]*', self.name)
+        words = PASCAL_SPLIT.findall(self.name)
         return ''.join(words) if words else self.name
 
     def generate_rust_struct(self, structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
@@ -277,20 +296,10 @@ class MatterCommandResponse:
         struct_name = self.get_rust_struct_name()
         func_name = f"decode_{escape_rust_keyword(convert_to_snake_case(self.name))}"
 
-        # Clean up command ID (remove 0x prefix if present)
-        clean_id = self.id.replace('0x', '') if self.id.startswith('0x') else self.id
-
-        # Generate field assignments using the shared helper
-        field_assignments_str = "\n".join(_generate_struct_field_assignments(self.fields, structs, enums, "item", bitmaps))
-
-        return f'''/// Decode {self.name} command response ({clean_id})
-pub fn {func_name}(inp: &tlv::TlvItemValue) -> anyhow::Result<{struct_name}> {{
-    if let tlv::TlvItemValue::List(_fields) = inp {{
-        let item = tlv::TlvItem {{ tag: 0, value: inp.clone() }};
-        Ok({struct_name} {{
-{field_assignments_str}
-        }})
-    }} else {{
-        Err(anyhow::anyhow!("Expected struct fields"))
-    }}
-}}'''
+        # Generate field assignments using the shared helper; fields are read
+        # from one pass over the borrowed element list
+        slots: Dict[Union[int, str], int] = {}
+        field_assignments_str = "\n".join(_generate_struct_field_assignments(self.fields, structs, enums, "item", bitmaps, slots))
+
+        return _render_list_value_decoder(f"/// Decode {self.name} command response ({self.clean_id})",
+                                          func_name, struct_name, field_assignments_str, slots)
@@ -2,100 +2,39 @@
 Matter enum and bitmap definitions.
 """
 
+import io
 import re
-from typing import List, Tuple
-
-
-class MatterEnum:
-    """Represents a Matter enum definition."""
-
-    def __init__(self, name: str):
-        self.name = name
-        self.items: List[Tuple[int, str, str]] = []  # (value, name, summary)
-        self._force_enum_suffix = False  # Set to True to keep "Enum" suffix
-
-    def add_item(self, value: int, item_name: str, summary: str = ""):
-        """Add an item to this enum."""
-        # Sanitize the item name to be a valid Rust identifier
-        sanitized_name = self._sanitize_variant_name(item_name)
-        self.items.append((value, sanitized_name, summary))
-
-    def _sanitize_variant_name(self, name: str) -> str:
-        """Sanitize enum variant name to be a valid Rust identifier."""
-        # Replace spaces with underscores
-        name = name.replace(' ', '_')
-
-        # Replace any other invalid characters
-        name = re.sub(r'[^a-zA-Z0-9_]', '_', name)
-
-        # Check if it starts with a digit BEFORE capitalizing
-        starts_with_digit = name and name[0].isdigit()
-
-        # Ensure it's in PascalCase for enum variants
-        # Split by underscore and capitalize each part
-        parts = name.split('_')
-        name = ''.join(part.capitalize() for part in parts if part)
-
-        # If original started with a digit, prefix with an underscore AFTER PascalCase conversion
-        if starts_with_digit:
-            name = f"_{name}"
-
-        return name if name else "Unknown"
-
-    def get_rust_enum_name(self) -> str:
-        """Convert enum name to PascalCase Rust enum name."""
-        # Keep "Enum" suffix if forced (to avoid name collisions)
-        if self._force_enum_suffix:
-            name = self.name
-        else:
-            # Remove "Enum" suffix if present for cleaner naming
-            name = self.name.replace('Enum', '')
-        # Split on capital letters and rejoin in PascalCase
-        words = re.findall(r'[A-Z][a-z]*', name)
-        return ''.join(words) if words else name
-
-    def generate_rust_enum(self) -> str:
-        """Generate Rust enum definition with proper derives."""
-        enum_name = self.get_rust_enum_name()
-
-        # Determine the repr type based on the maximum enum value
-        max_value = max(value for value, _, _ in self.items) if self.items else 0
-        if max_value <= 255:
-            repr_type = "u8"
-            value_type = "u8"
-        elif max_value <= 65535:
-            repr_type = "u16"
-            value_type = "u16"
-        else:
-            repr_type = "u32"
-            value_type = "u32"
-
-        # Generate enum variants
-        variant_definitions = []
-        for value, item_name, summary in self.items:
-            # Clean up variant name
-            variant_name = item_name
-            # Add doc comment if summary exists
-            if summary:
-                variant_definitions.append(f"    /// {summary}")
-            variant_definitions.append(f"    {variant_name} = {value},")
-
-        variants_str = "\n".join(variant_definitions)
-
-        # Generate the enum with proper derives
-        # For u8 enums, don't add the wrapper from_u8 method
-        if value_type == "u8":
-            return f'''#[derive(Debug, Clone, Copy, PartialEq, Eq, serde::Serialize, serde::Deserialize)]
+import sys
+from functools import lru_cache
+from typing import Dict, List, TextIO, Tuple
+
+from ..naming import PASCAL_SPLIT
+
+
+# Characters that may not appear in a Rust identifier
+_INVALID_CHARS = re.compile(r'[^a-zA-Z0-9_]')
+# The same replacement as a translation table, for the (usual) ASCII names
+_INVALID_ASCII_TABLE = str.maketrans({chr(c): '_' for c in range(128)
+                                      if not (chr(c).isalnum() or chr(c) == '_')})
+# Lower-to-upper case transition in a camelCase or PascalCase name
+_CAMEL_BOUNDARY = re.compile(r'([a-z])([A-Z])')
+_UNDERSCORES = re.compile(r'_+')
+# Indentation of a from_value match arm
+_ARM_INDENT = ' ' * 12
+
+# Enum definition up to the opening brace of the variant list
+_ENUM_HEAD_TMPL = '''#[derive(Debug, Clone, Copy, PartialEq, Eq, serde::Serialize, serde::Deserialize)]
 #[repr({repr_type})]
-pub enum {enum_name} {{
-{variants_str}
-}}
+pub enum {enum_name} {{'''
+
+# Rest of a u8 enum after its variants
+_ENUM_U8_IMPL_TMPL = '''}}
 
 impl {enum_name} {{
     /// Convert from u8 value
     pub fn from_u8(value: u8) -> Option<Self> {{
         match value {{
-{self._generate_from_value_arms(value_type)}
+{arms}
             _ => None,
         }}
     }}
@@ -111,12 +50,9 @@ impl From<{enum_name}> for u8 {{
         val as u8
     }}
 }}'''
-        else:
-            return f'''#[derive(Debug, Clone, Copy, PartialEq, Eq, serde::Serialize, serde::Deserialize)]
-#[repr({repr_type})]
-pub enum {enum_name} {{
-{variants_str}
-}}
+
+# Rest of a u16/u32 enum after its variants
+_ENUM_WIDE_IMPL_TMPL = '''}}
 
 impl {enum_name} {{
     /// Convert from u8 value (promoted to {value_type})
@@ -127,7 +63,7 @@ impl {enum_name} {{
     /// Convert from {value_type} value
     pub fn from_{value_type}(value: {value_type}) -> Option<Self> {{
         match value {{
-{self._generate_from_value_arms(value_type)}
+{arms}
             _ => None,
         }}
     }}
@@ -149,13 +85,137 @@ impl From<{enum_name}> for {value_type} {{
     }}
 }}'''
 
+
+def _replace_invalid_chars(name: str) -> str:
+    """Replace every character that may not appear in a Rust identifier with '_'."""
+    if name.isascii():
+        return name.translate(_INVALID_ASCII_TABLE)
+    return _INVALID_CHARS.sub('_', name)
+
+
+class MatterEnum:
+    """Represents a Matter enum definition."""
+
+    __slots__ = ('name', '_values', '_names', '_summaries', '_force_enum_suffix', '_rust_names')
+
+    def __init__(self, name: str) -> None:
+        self.name = sys.intern(name)
+        # Items are kept as parallel lists; `items` gives (value, name, summary) tuples
+        self._values: List[int] = []
+        self._names: List[str] = []
+        self._summaries: List[str] = []
+        self._force_enum_suffix = False  # Set to True to keep "Enum" suffix
+        # Memoized get_rust_enum_name results, keyed by _force_enum_suffix
+        self._rust_names: Dict[bool, str] = {}
+
+    def add_item(self, value: int, item_name: str, summary: str = "") -> None:
+        """Add an item to this enum."""
+        # Sanitize the item name to be a valid Rust identifier
+        sanitized_name = self._sanitize_variant_name(item_name)
+        self._values.append(value)
+        # Names and summaries ("Reserved", "Unknown", ...) repeat across enums
+        self._names.append(sys.intern(sanitized_name))
+        self._summaries.append(sys.intern(summary))
+
+    @property
+    def items(self) -> List[Tuple[int, str, str]]:
+        """The enum items as (value, name, summary) tuples."""
+        return list(zip(self._values, self._names, self._summaries))
+
+    @items.setter
+    def items(self, items: List[Tuple[int, str, str]]) -> None:
+        self._values = [value for value, _, _ in items]
+        self._names = [item_name for _, item_name, _ in items]
+        self._summaries = [summary for _, _, summary in items]
+
+    def _sanitize_variant_name(self, name: str) -> str:
+        """Sanitize enum variant name to be a valid Rust identifier."""
+        # Replace spaces and any other invalid characters with underscores
+        name = _replace_invalid_chars(name)
+
+        # Ensure it's in PascalCase for enum variants: capitalize each
+        # underscore-separated part (empty parts capitalize to '')
+        result = ''.join(map(str.capitalize, name.split('_')))
+
+        # If original started with a digit, prefix with an underscore AFTER PascalCase conversion
+        if name[:1].isdigit():
+            result = f"_{result}"
+
+        return result if result else "Unknown"
+
+    def get_rust_enum_name(self) -> str:
+        """Convert enum name to PascalCase Rust enum name."""
+        rust_name = self._rust_names.get(self._force_enum_suffix)
+        if rust_name is not None:
+            return rust_name
+        # Keep "Enum" suffix if forced (to avoid name collisions)
+        if self._force_enum_suffix:
+            name = self.name
+        else:
+            # Remove "Enum" suffix if present for cleaner naming
+            name = self.name.replace('Enum', '')
+        # Split on capital letters and rejoin in PascalCase
+        words = PASCAL_SPLIT.findall(name)
+        rust_name = self._rust_names[self._force_enum_suffix] = ''.join(words) if words else name
+        return rust_name
+
+    def generate_rust_enum(self) -> str:
+        """Generate Rust enum definition with proper derives."""
+        buf = io.StringIO()
+        self.write_to(buf)
+        return buf.getvalue()
+
+    def write_to(self, out: TextIO) -> None:
+        """Write the Rust enum definition (see generate_rust_enum) to `out`."""
+        enum_name = self.get_rust_enum_name()
+
+        # Determine the repr type based on the maximum enum value
+        max_value = max(self._values, default=0)
+        if max_value <= 255:
+            repr_type = "u8"
+            value_type = "u8"
+        elif max_value <= 65535:
+            repr_type = "u16"
+            value_type = "u16"
+        else:
+            repr_type = "u32"
+            value_type = "u32"
+
+        # Stream the head, the variants and the impl block straight to `out`
+        write = out.write
+        write(_ENUM_HEAD_TMPL.format(repr_type=repr_type, enum_name=enum_name))
+        # A value listed twice keeps only its first variant, as in from_value;
+        # rustc rejects a discriminant assigned more than once (E0081)
+        seen_values = set()
+        for value, item_name, summary in zip(self._values, self._names, self._summaries):
+            if value in seen_values:
+                continue
+            seen_values.add(value)
+            # Add doc comment if summary exists
+            if summary:
+                write(f"\n    /// {summary}")
+            write(f"\n    {item_name} = {value},")
+        if not self._values:
+            write("\n")
+
+        # For u8 enums, don't add the wrapper from_{value_type} method
+        impl_template = _ENUM_U8_IMPL_TMPL if value_type == "u8" else _ENUM_WIDE_IMPL_TMPL
+        write("\n")
+        write(impl_template.format(enum_name=enum_name, value_type=value_type,
+                                   arms=self._generate_from_value_arms(value_type)))
+
     def _generate_from_value_arms(self, value_type: str) -> str:
-        """Generate match arms for from_value conversion."""
+        """Generate match arms for from_value conversion.
+
+        Arms are emitted in ascending value order so rustc sees a monotonic
+        table, and a value listed twice keeps only its first variant (a later
+        arm for it would be unreachable).
+        """
         enum_name = self.get_rust_enum_name()
-        arms = []
-        for value, item_name, _ in self.items:
-            arms.append(f"            {value} => Some({enum_name}::{item_name}),")
-        return "\n".join(arms)
+        # Built from the back so the first variant of a repeated value wins
+        first_variant = dict(zip(reversed(self._values), reversed(self._names)))
+        return "\n".join(f"{_ARM_INDENT}{value} => Some({enum_name}::{item_name}),"
+                         for value, item_name in sorted(first_variant.items()))
 
 
 def generate_bitmap_macro() -> str:
@@ -168,44 +228,73 @@ def generate_bitmap_macro() -> str:
     return ''  # No longer needed - using shared bitmap type
 
 
+@lru_cache(maxsize=None)
+def _bitfield_constant_name(name: str) -> str:
+    """SCREAMING_SNAKE_CASE constant name for a bitfield name.
+
+    Bitfield names repeat across bitmaps and clusters, so results are cached.
+    """
+    # Replace spaces and any other invalid characters (e.g., hyphens,
+    # special chars) with underscores
+    name = _replace_invalid_chars(name)
+
+    # Handle camelCase and PascalCase by inserting underscores before capitals
+    name = _CAMEL_BOUNDARY.sub(r'\1_\2', name).upper()
+
+    # Remove consecutive underscores
+    if '__' in name:
+        name = _UNDERSCORES.sub('_', name)
+
+    # If it starts with a digit, prefix with "BIT_"
+    if name[:1].isdigit():
+        name = f"BIT_{name}"
+
+    return name if name else "UNKNOWN"
+
+
 class MatterBitmap:
     """Represents a Matter bitmap definition."""
 
-    def __init__(self, name: str):
-        self.name = name
-        self.bitfields: List[Tuple[int, str, str]] = []  # (bit_position, name, summary)
+    __slots__ = ('name', '_bit_positions', '_names', '_summaries', '_max_bit', '_force_bitmap_suffix', '_rust_names')
+
+    def __init__(self, name: str) -> None:
+        self.name = sys.intern(name)
+        # Bitfields are kept as parallel lists; `bitfields` gives
+        # (bit_position, name, summary) tuples
+        self._bit_positions: List[int] = []
+        self._names: List[str] = []
+        self._summaries: List[str] = []
+        # Highest bit position so far (-1 when empty); picks the base type,
+        # which every field and decoder using the bitmap asks for
+        self._max_bit = -1
         self._force_bitmap_suffix = False  # Set to True to keep "Bitmap" suffix
+        # Memoized get_rust_bitmap_name results, keyed by _force_bitmap_suffix
+        self._rust_names: Dict[bool, str] = {}
 
-    def add_bitfield(self, bit_pos: int, field_name: str, summary: str = ""):
+    def add_bitfield(self, bit_pos: int, field_name: str, summary: str = "") -> None:
         """Add a bitfield to this bitmap."""
         # Sanitize the bitfield name to be a valid Rust constant identifier
         sanitized_name = self._sanitize_bitfield_name(field_name)
-        self.bitfields.append((bit_pos, sanitized_name, summary))
+        self._bit_positions.append(bit_pos)
+        if bit_pos > self._max_bit:
+            self._max_bit = bit_pos
+        self._names.append(sys.intern(sanitized_name))
+        self._summaries.append(sys.intern(summary))
+
+    @property
+    def bitfields(self) -> List[Tuple[int, str, str]]:
+        """The bitfields as (bit_position, name, summary) tuples."""
+        return list(zip(self._bit_positions, self._names, self._summaries))
 
     def _sanitize_bitfield_name(self, name: str) -> str:
         """Sanitize bitfield name to be a valid Rust constant identifier (SCREAMING_SNAKE_CASE)."""
-        # Replace spaces with underscores
-        name = name.replace(' ', '_')
-
-        # Replace any other invalid characters (e.g., hyphens, special chars)
-        name = re.sub(r'[^a-zA-Z0-9_]', '_', name)
-
-        # Convert to SCREAMING_SNAKE_CASE
-        # Handle camelCase and PascalCase by inserting underscores before capitals
-        name = re.sub(r'([a-z])([A-Z])', r'\1_\2', name)
-        name = name.upper()
-
-        # Remove consecutive underscores
-        name = re.sub(r'_+', '_', name)
-
-        # If it starts with a digit, prefix with "BIT_"
-        if name and name[0].isdigit():
-            name = f"BIT_{name}"
-
-        return name if name else "UNKNOWN"
+        return _bitfield_constant_name(name)
 
     def get_rust_bitmap_name(self) -> str:
         """Convert bitmap name to PascalCase Rust type name."""
+        rust_name = self._rust_names.get(self._force_bitmap_suffix)
+        if rust_name is not None:
+            return rust_name
         # Keep "Bitmap" suffix if forced (to avoid name collisions)
         if self._force_bitmap_suffix:
             name = self.name
@@ -213,16 +302,14 @@ class MatterBitmap:
             # Remove "Bitmap" suffix if present for cleaner naming
             name = self.name.replace('Bitmap', '')
         # Split on capital letters and rejoin in PascalCase
-        words = re.findall(r'[A-Z][a-z]*', name)
-        return ''.join(words) if words else name
+        words = PASCAL_SPLIT.findall(name)
+        rust_name = self._rust_names[self._force_bitmap_suffix] = ''.join(words) if words else name
+        return rust_name
 
     def get_base_type(self) -> str:
         """Determine the base type (u8/u16/u32/u64) based on maximum bit position."""
-        if not self.bitfields:
-            return "u8"  # Default to u8 for empty bitmaps
-
-        max_bit = max(bit_pos for bit_pos, _, _ in self.bitfields)
-
+        # Empty bitmaps (_max_bit == -1) default to u8
+        max_bit = self._max_bit
         if max_bit < 8:
             return "u8"
         elif max_bit < 16:
@@ -239,32 +326,27 @@ class MatterBitmap:
         1. A type alias to the base integer type (e.g., type OnOffControl = u8)
         2. A module with the bitfield constants (e.g., mod on_off_control)
         """
+        buf = io.StringIO()
+        self.write_to(buf)
+        return buf.getvalue()
+
+    def write_to(self, out: TextIO) -> None:
+        """Write the Rust bitmap definition (see generate_rust_bitmap) to `out`."""
         bitmap_name = self.get_rust_bitmap_name()
         base_type = self.get_base_type()
 
-        # Generate bitfield constants
-        constants = []
-        for bit_pos, field_name, summary in self.bitfields:
-            bit_value = 1 << bit_pos
-            if summary:
-                constants.append(f"    /// {summary}")
-            constants.append(f"    pub const {field_name}: {base_type} = 0x{bit_value:02X};")
-
         # Generate simple type alias
-        result = f'''/// {bitmap_name} bitmap type
-pub type {bitmap_name} = {base_type};'''
+        write = out.write
+        write(f"/// {bitmap_name} bitmap type\npub type {bitmap_name} = {base_type};")
 
         # Add module with constants if any
-        if constants:
+        if self._bit_positions:
             module_name = bitmap_name.lower().replace('bitmap', '').strip('_')
             if not module_name:
                 module_name = bitmap_name.lower()
-            constants_str = "\n".join(constants)
-            result += f'''
-
-/// Constants for {bitmap_name}
-pub mod {module_name} {{
-{constants_str}
-}}'''
-
-        return result
+            write(f"\n\n/// Constants for {bitmap_name}\npub mod {module_name} {{")
+            for bit_pos, field_name, summary in zip(self._bit_positions, self._names, self._summaries):
+                if summary:
+                    write(f"\n    /// {summary}")
+                write(f"\n    pub const {field_name}: {base_type} = 1 << {bit_pos};")
+            write("\n}")
@@ -2,6 +2,7 @@
 Unified field representation for Matter commands, structs, and attributes.
 """
 
+import sys
 from typing import Optional, Dict, TYPE_CHECKING
 
 from ..naming import (
@@ -21,6 +22,10 @@ class MatterField:
     providing a single consistent data structure for all field types.
     """
 
+    # Thousands of fields are created per run; keep them dict-free
+    __slots__ = ('id', 'name', 'field_type', 'entry_type', 'default', 'nullable',
+                 'mandatory', '_param_name', '_default_values')
+
     def __init__(
         self,
         id: int,
@@ -30,7 +35,7 @@ class MatterField:
         default: Optional[str] = None,
         nullable: bool = False,
         mandatory: bool = True
-    ):
+    ) -> None:
         """
         Initialize a MatterField.
 
@@ -44,12 +49,19 @@ class MatterField:
             mandatory: Whether this field is mandatory
         """
         self.id = id
-        self.name = name
-        self.field_type = field_type
-        self.entry_type = entry_type
+        # Names and types are compared and used as dict keys all through code
+        # generation, so intern them once here
+        self.name = sys.intern(name)
+        self.field_type = sys.intern(field_type)
+        self.entry_type = sys.intern(entry_type) if entry_type is not None else None
         self.default = default
         self.nullable = nullable
         self.mandatory = mandatory
+        # Memoized get_rust_param_name result
+        self._param_name: Optional[str] = None
+        # Memoized _get_default_value results, keyed by field_type (typedef
+        # resolution may still rewrite it after construction)
+        self._default_values: Dict[str, str] = {}
 
     @property
     def is_list(self) -> bool:
@@ -58,7 +70,9 @@ class MatterField:
 
     def get_rust_param_name(self) -> str:
         """Convert field name to snake_case Rust parameter name."""
-        return escape_rust_keyword(convert_to_snake_case(self.name))
+        if self._param_name is None:
+            self._param_name = escape_rust_keyword(convert_to_snake_case(self.name))
+        return self._param_name
 
     def _get_default_value(self, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
         """
@@ -71,6 +85,13 @@ class MatterField:
         Returns:
             Rust code string representing the default value
         """
+        default_value = self._default_values.get(self.field_type)
+        if default_value is None:
+            default_value = self._default_values[self.field_type] = self._compute_default_value()
+        return default_value
+
+    def _compute_default_value(self) -> str:
+        """Derive the Rust default value from field_type and the XML default."""
         if not self.default:
             # No default specified, use type-appropriate fallback
             if self.field_type == 'string':
@@ -107,13 +128,3 @@ class MatterField:
         else:
             # For numeric types, use the default value directly
             return self.default
-
-    def __iter__(self):
-        """
-        Tuple compatibility: allows (id, name, type, entry_type) destructuring.
-
-        This enables gradual migration from tuple-based code by allowing existing
-        loops like `for field_id, field_name, field_type, entry_type in fields`
-        to continue working without changes.
-        """
-        return iter((self.id, self.name, self.field_type, self.entry_type))
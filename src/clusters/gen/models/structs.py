@@ -2,10 +2,11 @@
 Matter struct definitions.
 """
 
-import re
-from typing import Dict, List, Optional, TYPE_CHECKING
+import sys
+import textwrap
+from typing import Dict, List, Optional, TYPE_CHECKING, Union
 
-from ..naming import convert_to_snake_case, escape_rust_keyword
+from ..naming import PASCAL_SPLIT, convert_to_snake_case, escape_rust_keyword
 from ..type_mapping import MatterType
 from .field import MatterField
 
@@ -13,25 +14,53 @@ if TYPE_CHECKING:
     from .enums import MatterEnum, MatterBitmap
 
 
+# Shared struct decoder; {scan} fills `fields` with the first element per tag
+_SLOT_DECODER_TMPL = '''/// Decode {name} fields
+fn {func_name}(value: &tlv::TlvItemValue) -> {struct_name} {{
+    // First element for each field tag, collected in one pass
+    let mut fields: [Option<&tlv::TlvItem>; {n}] = [None; {n}];
+    if let tlv::TlvItemValue::List(l) = value {{
+{scan}
+    }}
+    {struct_name} {{
+{assignments}
+    }}
+}}'''
+
+# Struct decoder that reads no fields
+_EMPTY_DECODER_TMPL = '''/// Decode {name} fields
+fn {func_name}(_value: &tlv::TlvItemValue) -> {struct_name} {{
+    {struct_name} {{
+{assignments}
+    }}
+}}'''
+
+
 class MatterStruct:
     """Represents a Matter struct definition."""
 
-    def __init__(self, name: str):
-        self.name = name
+    __slots__ = ('name', 'fields', '_rust_name')
+
+    def __init__(self, name: str) -> None:
+        self.name = sys.intern(name)
         self.fields: List[MatterField] = []
+        # Memoized get_rust_struct_name result
+        self._rust_name: Optional[str] = None
 
-    def add_field(self, field: MatterField):
+    def add_field(self, field: MatterField) -> None:
         """Add a field to this struct."""
         self.fields.append(field)
 
     def get_rust_struct_name(self) -> str:
         """Convert struct name to PascalCase Rust struct name."""
-        # Remove "Struct" suffix if present
-        name = self.name.replace('Struct', '')
-        # Split on capital letters and rejoin in PascalCase
-        # Handle cases like "DeviceTypeStruct" -> "DeviceType"
-        words = re.findall(r'[A-Z][a-z]*', name)
-        return ''.join(words) if words else name
+        if self._rust_name is None:
+            # Remove "Struct" suffix if present
+            name = self.name.replace('Struct', '')
+            # Split on capital letters and rejoin in PascalCase
+            # Handle cases like "DeviceTypeStruct" -> "DeviceType"
+            words = PASCAL_SPLIT.findall(name)
+            self._rust_name = ''.join(words) if words else name
+        return self._rust_name
 
     def generate_rust_struct(self, structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
         """Generate Rust struct definition."""
@@ -40,18 +69,20 @@ class MatterStruct:
         struct_name = self.get_rust_struct_name()
         return _generate_rust_struct_definition(struct_name, self.fields, structs, enums, bitmaps)
 
-    def generate_decode_function(self, is_list: bool = False, structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
-        """Generate decode function for this struct."""
-        from .tlv_helpers import _generate_struct_field_assignments
+    def get_rust_decode_function_name(self) -> str:
+        """Name of the shared field decoder emitted for this struct."""
+        return f"decode_{convert_to_snake_case(self.name)}"
 
-        struct_name = self.get_rust_struct_name()
-        func_name = f"decode_{convert_to_snake_case(self.name)}"
+    def generate_decode_function(self, structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
+        """Generate the shared field decoder for this struct.
 
-        if is_list:
-            func_name += "_list"
-            return_type = f"Vec<{struct_name}>"
-        else:
-            return_type = struct_name
+        Attribute, response and event decoders call this helper (see
+        `_struct_decoder_call`) instead of inlining the field assignments.
+        """
+        from .tlv_helpers import _field_slot_scan, _generate_struct_field_assignments
+
+        struct_name = self.get_rust_struct_name()
+        func_name = self.get_rust_decode_function_name()
 
         # Use shared helper to generate field assignments
         if structs is None:
@@ -59,33 +90,18 @@ class MatterStruct:
         if enums is None:
             enums = {}
 
+        # Fields read from the slots filled by one pass over the struct's
+        # elements instead of a linear TlvItem::get scan per field
+        slots: Dict[Union[int, str], int] = {}
         field_assignments = _generate_struct_field_assignments(
-            self.fields, structs, enums, "item", bitmaps
+            self.fields, structs, enums, "item", bitmaps, slots
         )
-        assignments_str = "\n".join(field_assignments)
-
-        if is_list:
-            decode_logic = f'''    let mut res = Vec::new();
-    if let tlv::TlvItemValue::List(v) = inp {{
-        for item in v {{
-            res.push({struct_name} {{
-{assignments_str}
-            }});
-        }}
-    }}
-    Ok(res)'''
-        else:
-            decode_logic = f'''    if let tlv::TlvItemValue::List(fields) = inp {{
-        // Single struct with fields
-        let item = tlv::TlvItem {{ tag: 0, value: inp.clone() }};
-        Ok({struct_name} {{
-{assignments_str}
-        }})
-    }} else {{
-        Err(anyhow::anyhow!("Expected struct fields"))
-    }}'''
-
-        return f'''/// Decode {self.name}
-pub fn {func_name}(inp: &tlv::TlvItemValue) -> anyhow::Result<{return_type}> {{
-{decode_logic}
-}}'''
+        # Assignments are emitted for a struct literal nested two levels deeper
+        assignments_str = textwrap.indent(textwrap.dedent("\n".join(field_assignments)), "        ")
+
+        if not slots:
+            return _EMPTY_DECODER_TMPL.format(name=self.name, func_name=func_name, struct_name=struct_name,
+                                              assignments=assignments_str)
+        return _SLOT_DECODER_TMPL.format(name=self.name, func_name=func_name, struct_name=struct_name,
+                                         n=len(slots), scan=_field_slot_scan(slots, 2),
+                                         assignments=assignments_str)
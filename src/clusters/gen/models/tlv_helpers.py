@@ -2,10 +2,10 @@
 Helper functions for TLV encoding and decoding code generation.
 """
 
-import re
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union, TYPE_CHECKING
 
-from ..naming import convert_to_snake_case, escape_rust_keyword, is_numeric_or_id_type
+from ..naming import PASCAL_SPLIT, is_numeric_or_id_type
 from ..type_mapping import MatterType
 
 if TYPE_CHECKING:
@@ -14,6 +14,60 @@ if TYPE_CHECKING:
     from .field import MatterField
 
 
+# Indentation per nesting level of generated Rust, in 4-space steps
+_IND = [" " * (4 * i) for i in range(32)]
+
+# TLV type names of the integer types (UInt8..UInt64, Int8..Int64)
+_INT_TLV_TYPES = frozenset(MatterType.TLV_TO_RUST)
+
+# Struct decoders requested while generating the current cluster, keyed by
+# Matter struct name. Decoders call the shared helper instead of inlining the
+# struct's field assignments; the orchestrator resets the registry per cluster
+# and emits each collected helper once.
+_decoder_registry: Dict[str, str] = {}
+
+# Encoded field lines per (struct name, value path, depth, target vector) for
+# the current cluster; command params reuse the same structs many times.
+_struct_encoding_cache: Dict[Tuple[str, str, int, str], List[str]] = {}
+
+# Encoded lines per (field id, rust field, field type, list entry type, value
+# path, depth, target vector) for the current cluster; sibling structs repeat
+# the same fields.
+_field_encoding_cache: Dict[Tuple[int, str, str, Optional[str], str, int, str], Tuple[str, ...]] = {}
+
+# Joined closure body of _STRUCT_LIST_PARAM_ENC_TMPL per entry struct name for
+# the current cluster; it depends only on the struct, not the parameter.
+_struct_list_body_cache: Dict[str, str] = {}
+
+# list_util call template per enum/bitmap list entry type for the current
+# cluster ('' when no helper fits); built-in entry types use
+# _LIST_PRIMITIVE_TEMPLATES instead.
+_list_entry_type_cache: Dict[str, str] = {}
+
+
+def reset_decoder_registry() -> None:
+    """Forget struct decoders and encodings collected for the previous cluster."""
+    _decoder_registry.clear()
+    _struct_encoding_cache.clear()
+    _field_encoding_cache.clear()
+    _struct_list_body_cache.clear()
+    _list_entry_type_cache.clear()
+
+
+def take_struct_decoders() -> List[str]:
+    """Return the struct decoders collected so far and reset the registry."""
+    decoders = list(_decoder_registry.values())
+    _decoder_registry.clear()
+    return decoders
+
+
+def _struct_decoder_call(struct: 'MatterStruct', item_expr: str, structs: Dict[str, 'MatterStruct'], enums: Dict[str, 'MatterEnum'], bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
+    """Return a call to the shared decoder for `struct`, registering it on first use."""
+    if struct.name not in _decoder_registry:
+        # Reserve the slot first so nested references don't recurse forever
+        _decoder_registry[struct.name] = ""
+        _decoder_registry[struct.name] = struct.generate_decode_function(structs, enums, bitmaps)
+    return f"{struct.get_rust_decode_function_name()}({item_expr})"
 
 
 def _get_value_cast_expr(value_var: str, matter_type: str, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
@@ -52,32 +106,151 @@ def _get_value_cast_expr(value_var: str, matter_type: str, enums: Optional[Dict[
         return f'{value_var} as {rust_type}'
 
 
-def _generate_list_item_filter_expr(entry_type: str, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
-    """Generate the filter_map expression for decoding a list item.
+def _classify_list_entry(entry_type: str, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> Tuple[str, str]:
+    """Classify a list entry type for the list decoders.
 
-    Returns a string like: 'if let tlv::TlvItemValue::String(s) = &e.value { Some(s.clone()) } else { None }'
+    Returns (kind, rust_type). kind is the TLV value variant holding the
+    elements ('String', 'Bool', 'OctetString' or 'Int'), 'Enum' for lists of a
+    known enum, or 'Unsupported'. rust_type is the element type; bitmaps
+    decode to their base integer type.
     """
     tlv_type = MatterType.get_tlv_type(entry_type, bitmaps=bitmaps)
-    rust_type = MatterType.get_rust_type(entry_type, enums=enums, bitmaps=bitmaps)
-
-    if tlv_type == "String":
-        return 'if let tlv::TlvItemValue::String(v) = &e.value { Some(v.clone()) } else { None }'
-    elif tlv_type == "Bool":
-        return 'if let tlv::TlvItemValue::Bool(v) = &e.value { Some(*v) } else { None }'
-    elif tlv_type == "OctetString":
-        return 'if let tlv::TlvItemValue::OctetString(v) = &e.value { Some(v.clone()) } else { None }'
-    elif tlv_type.startswith("UInt") or tlv_type.startswith("Int"):
+    if tlv_type in ("String", "Bool", "OctetString"):
+        return tlv_type, MatterType.get_rust_type(entry_type, enums=enums, bitmaps=bitmaps)
+    if tlv_type in _INT_TLV_TYPES:
         if entry_type.endswith('Enum') and enums and entry_type in enums:
-            return f'if let tlv::TlvItemValue::Int(v) = &e.value {{ {rust_type}::from_u8(*v as u8) }} else {{ None }}'
-        elif entry_type.endswith('Bitmap') and bitmaps and entry_type in bitmaps:
-            bitmap_obj = bitmaps[entry_type]
-            base_type = bitmap_obj.get_base_type()
-            return f'if let tlv::TlvItemValue::Int(v) = &e.value {{ Some(*v as {base_type}) }} else {{ None }}'
-        else:
-            cast_expr = _get_value_cast_expr('*v', entry_type, enums, bitmaps)
-            return f'if let tlv::TlvItemValue::Int(v) = &e.value {{ Some({cast_expr}) }} else {{ None }}'
-    else:
+            return 'Enum', MatterType.get_rust_type(entry_type, enums=enums, bitmaps=bitmaps)
+        if entry_type.endswith('Bitmap') and bitmaps and entry_type in bitmaps:
+            return 'Int', bitmaps[entry_type].get_base_type()
+        return 'Int', MatterType.get_rust_type(entry_type, enums=enums, bitmaps=bitmaps)
+    return 'Unsupported', MatterType.get_rust_type(entry_type, enums=enums, bitmaps=bitmaps)
+
+
+def _list_element_value(kind: str, rust_type: str, var: str) -> str:
+    """Return the element value for a list element bound to `var` by `if let tlv::TlvItemValue::<kind>(var)`."""
+    if kind == 'Bool':
+        return f'*{var}'
+    if kind == 'Int':
+        return f'*{var}' if rust_type == 'u64' else f'*{var} as {rust_type}'
+    return f'{var}.clone()'
+
+
+def _generate_list_item_filter_expr(entry_type: str, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
+    """Generate the expression decoding one list element to an Option.
+
+    Returns a string like: 'if let tlv::TlvItemValue::String(s) = &e.value { Some(s.clone()) } else { None }'
+    """
+    kind, rust_type = _classify_list_entry(entry_type, enums, bitmaps)
+    if kind == 'Unsupported':
         return 'None  // Unsupported type'
+    if kind == 'Enum':
+        return f'if let tlv::TlvItemValue::Int(v) = &e.value {{ {rust_type}::from_u8(*v as u8) }} else {{ None }}'
+    return f'if let tlv::TlvItemValue::{kind}(v) = &e.value {{ Some({_list_element_value(kind, rust_type, "v")}) }} else {{ None }}'
+
+
+def _list_primitive_field_assignment(rust_field_name: str, field_value: str, rust_type: str, value_map: str) -> str:
+    """Render the struct field assignment decoding a list of primitive values.
+
+    `field_value` is the Option<&TlvItemValue> expression for the list field.
+    """
+    return f'''                {rust_field_name}: {{
+                    if let Some(tlv::TlvItemValue::List(l)) = {field_value} {{
+                        let mut items: Vec<{rust_type}> = Vec::with_capacity(l.len());
+                        for e in l {{
+                            if let Some(v) = {{ {value_map} }} {{
+                                items.push(v);
+                            }}
+                        }}
+                        Some(items)
+                    }} else {{
+                        None
+                    }}
+                }},'''
+
+
+_LIST_UTIL = 'crate::clusters::codec::list_util'
+
+_LIST_HELPER_BY_KIND = {
+    'String': 'decode_string_list',
+    'Bool': 'decode_bool_list',
+    'OctetString': 'decode_octet_string_list',
+}
+
+_INT_LIST_ELEMENT_TYPES = frozenset(('u8', 'u16', 'u32', 'u64', 'i8', 'i16', 'i32', 'i64'))
+
+
+def _list_helper_template(entry_type: str, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> Optional[str]:
+    """Return the list_util call decoding a list of `entry_type`, or None if no helper fits.
+
+    The result is a `str.format` template with `{name}` and `{field}`
+    placeholders, `{field}` being the Option<&TlvItemValue> for the list.
+    """
+    kind, rust_type = _classify_list_entry(entry_type, enums, bitmaps)
+    if kind in _LIST_HELPER_BY_KIND:
+        call = f'{_LIST_HELPER_BY_KIND[kind]}({{field}})'
+    elif kind == 'Enum':
+        call = f'decode_int_list_with({{field}}, |v| {rust_type}::from_u8(v as u8))'
+    elif kind == 'Int' and rust_type in _INT_LIST_ELEMENT_TYPES:
+        call = f'decode_{rust_type}_list({{field}})'
+    else:
+        return None
+    return f'                {{name}}: {_LIST_UTIL}::{call},'
+
+
+def _build_list_primitive_templates() -> Dict[str, str]:
+    """Pre-render the list_util call for every built-in Matter type that has a helper."""
+    templates = {}
+    for matter_type in MatterType.TYPE_MAP:
+        template = _list_helper_template(matter_type)
+        if template is not None:
+            templates[matter_type] = template
+    return templates
+
+
+_LIST_PRIMITIVE_TEMPLATES = _build_list_primitive_templates()
+
+
+# Attribute list decoder skeleton; {body} runs once per element bound to `item`
+_LIST_DECODER_TMPL = '''    let mut res = Vec::new();
+    if let tlv::TlvItemValue::List(v) = inp {{
+        res.reserve(v.len());
+        for item in v {{
+{body}
+        }}
+    }}
+    Ok(res)'''
+
+# Element body pushing {value} when the element holds the expected TLV variant
+_LIST_ELEMENT_TMPL = '''            if let tlv::TlvItemValue::{variant}({binding}) = &item.value {{
+                res.push({value});
+            }}'''
+
+# Element body for enum lists; values without a matching variant are dropped
+_LIST_ENUM_ELEMENT_TMPL = '''            if let tlv::TlvItemValue::Int(i) = &item.value {{
+                if let Some(enum_val) = {enum_name}::from_u8(*i as u8) {{
+                    res.push(enum_val);
+                }}
+            }}'''
+
+# Binding name for the element value per TLV variant in _LIST_ELEMENT_TMPL
+_LIST_ELEMENT_BINDINGS = {'String': 's', 'Bool': 'b', 'OctetString': 'o', 'Int': 'i'}
+
+_LIST_DEFAULT_ELEMENT = '''            // TODO: Handle custom struct type decoding
+            res.push(Default::default());'''
+
+# Complete list decoders for the element kinds whose code does not depend on
+# the entry type (the element value is the bound String/bool/Vec<u8> itself)
+_FIXED_LIST_DECODERS = {
+    kind: _LIST_DECODER_TMPL.format(body=_LIST_ELEMENT_TMPL.format(
+        variant=kind, binding=_LIST_ELEMENT_BINDINGS[kind],
+        value=_list_element_value(kind, '', _LIST_ELEMENT_BINDINGS[kind])))
+    for kind in ('String', 'Bool', 'OctetString')
+}
+_FIXED_LIST_DECODERS['Unsupported'] = _LIST_DECODER_TMPL.format(body=_LIST_DEFAULT_ELEMENT)
+
+# Integer and enum list decoders per (kind, element Rust type); they don't
+# depend on the cluster, so identical lists share one string for the whole run
+_list_decoder_cache: Dict[Tuple[str, str], str] = {}
 
 
 def _generate_list_decoder(entry_type: str, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
@@ -91,86 +264,55 @@ def _generate_list_decoder(entry_type: str, enums: Optional[Dict[str, 'MatterEnu
     Returns:
         String containing the complete decode_logic code block
     """
-    tlv_type = MatterType.get_tlv_type(entry_type, bitmaps=bitmaps)
-    rust_type = MatterType.get_rust_type(entry_type, enums=enums, bitmaps=bitmaps)
-
-    if tlv_type == "String":
-        return '''    let mut res = Vec::new();
-    if let tlv::TlvItemValue::List(v) = inp {
-        for item in v {
-            if let tlv::TlvItemValue::String(s) = &item.value {
-                res.push(s.clone());
-            }
-        }
-    }
-    Ok(res)'''
-    elif tlv_type == "Bool":
-        return '''    let mut res = Vec::new();
-    if let tlv::TlvItemValue::List(v) = inp {
-        for item in v {
-            if let tlv::TlvItemValue::Bool(b) = &item.value {
-                res.push(*b);
-            }
-        }
-    }
-    Ok(res)'''
-    elif tlv_type == "OctetString":
-        return '''    let mut res = Vec::new();
-    if let tlv::TlvItemValue::List(v) = inp {
-        for item in v {
-            if let tlv::TlvItemValue::OctetString(o) = &item.value {
-                res.push(o.clone());
-            }
-        }
-    }
-    Ok(res)'''
-    elif tlv_type.startswith("UInt") or tlv_type.startswith("Int"):
-        # Check if this is an enum type
-        if entry_type.endswith('Enum') and enums and entry_type in enums:
-            return f'''    let mut res = Vec::new();
-    if let tlv::TlvItemValue::List(v) = inp {{
-        for item in v {{
-            if let tlv::TlvItemValue::Int(i) = &item.value {{
-                if let Some(enum_val) = {rust_type}::from_u8(*i as u8) {{
-                    res.push(enum_val);
-                }}
-            }}
-        }}
-    }}
-    Ok(res)'''
-        elif entry_type.endswith('Bitmap') and bitmaps and entry_type in bitmaps:
-            bitmap_obj = bitmaps[entry_type]
-            base_type = bitmap_obj.get_base_type()
-            return f'''    let mut res = Vec::new();
-    if let tlv::TlvItemValue::List(v) = inp {{
-        for item in v {{
-            if let tlv::TlvItemValue::Int(i) = &item.value {{
-                res.push(*i as {base_type});
-            }}
-        }}
-    }}
-    Ok(res)'''
+    kind, rust_type = _classify_list_entry(entry_type, enums, bitmaps)
+    if (decoder := _FIXED_LIST_DECODERS.get(kind)) is not None:
+        return decoder
+    decoder = _list_decoder_cache.get((kind, rust_type))
+    if decoder is None:
+        if kind == 'Enum':
+            body = _LIST_ENUM_ELEMENT_TMPL.format(enum_name=rust_type)
         else:
-            cast_expr = _get_value_cast_expr('*i', entry_type, enums, bitmaps)
-            return f'''    let mut res = Vec::new();
-    if let tlv::TlvItemValue::List(v) = inp {{
-        for item in v {{
-            if let tlv::TlvItemValue::Int(i) = &item.value {{
-                res.push({cast_expr});
-            }}
-        }}
-    }}
-    Ok(res)'''
-    else:
-        # Default fallback
-        return '''    let mut res = Vec::new();
-    if let tlv::TlvItemValue::List(v) = inp {
-        for item in v {
-            // TODO: Handle custom struct type decoding
-            res.push(Default::default());
-        }
-    }
-    Ok(res)'''
+            binding = _LIST_ELEMENT_BINDINGS[kind]
+            body = _LIST_ELEMENT_TMPL.format(variant=kind, binding=binding,
+                                             value=_list_element_value(kind, rust_type, binding))
+        decoder = _list_decoder_cache[(kind, rust_type)] = _LIST_DECODER_TMPL.format(body=body)
+    return decoder
+
+
+# Match pattern and value expression for the non-integer scalar TLV types
+_SINGLE_VALUE_BINDINGS = {
+    "String": ('tlv::TlvItemValue::String(v)', 'v.clone()'),
+    "Bool": ('tlv::TlvItemValue::Bool(v)', '*v'),
+    "OctetString": ('tlv::TlvItemValue::OctetString(v)', 'v.clone()'),
+}
+
+# Single value decoder body; {ok} is returned for the expected variant bound
+# by {pattern}, {fallback} for anything else
+_SINGLE_VALUE_MATCH_TMPL = '''    match inp {{
+        {pattern} => {ok},
+        _ => {fallback},
+    }}'''
+
+# Complete single value decoders per (TLV type, nullable) for the types in
+# _SINGLE_VALUE_BINDINGS, whose code does not depend on the Matter type
+_FIXED_SINGLE_VALUE_DECODERS = {
+    (tlv_type, nullable): _SINGLE_VALUE_MATCH_TMPL.format(
+        pattern=pattern,
+        ok=f'Ok(Some({value_expr}))' if nullable else f'Ok({value_expr})',
+        fallback='Ok(None)' if nullable else f'Err(anyhow::anyhow!("Expected {tlv_type}"))')
+    for tlv_type, (pattern, value_expr) in _SINGLE_VALUE_BINDINGS.items()
+    for nullable in (False, True)
+}
+
+# Decoders for types with no TLV mapping, per nullable
+_UNSUPPORTED_SINGLE_VALUE_DECODERS = {
+    True: '    // TODO: Handle nullable custom type decoding\n    Ok(None)',
+    False: '    // TODO: Handle custom type decoding\n    Err(anyhow::anyhow!("Unsupported type"))',
+}
+
+# Plain integer decoders per (TLV type, value expression, nullable); shared by
+# every attribute of the same integer type across clusters
+_int_value_decoder_cache: Dict[Tuple[str, str, bool], str] = {}
 
 
 def _generate_single_value_decoder(attr_type: str, nullable: bool, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
@@ -186,89 +328,71 @@ def _generate_single_value_decoder(attr_type: str, nullable: bool, enums: Option
         String containing the decode_logic code block
     """
     tlv_type = MatterType.get_tlv_type(attr_type, bitmaps=bitmaps)
-    rust_type = MatterType.get_rust_type(attr_type, enums=enums, bitmaps=bitmaps)
-
-    # Generate the value expression and match pattern for each type
-    if tlv_type == "String":
-        match_pattern = 'tlv::TlvItemValue::String(v)'
-        value_expr = 'v.clone()'
-    elif tlv_type == "Bool":
-        match_pattern = 'tlv::TlvItemValue::Bool(v)'
-        value_expr = '*v'
-    elif tlv_type == "OctetString":
-        match_pattern = 'tlv::TlvItemValue::OctetString(v)'
-        value_expr = 'v.clone()'
-    elif tlv_type.startswith("UInt") or tlv_type.startswith("Int"):
+    if (decoder := _FIXED_SINGLE_VALUE_DECODERS.get((tlv_type, nullable))) is not None:
+        return decoder
+
+    # Generate the value expression and match pattern for integer types
+    if tlv_type in _INT_TLV_TYPES:
         match_pattern = 'tlv::TlvItemValue::Int(v)'
         # Check if this is an enum type
         if attr_type.endswith('Enum') and enums and attr_type in enums:
             enum_name = enums[attr_type].get_rust_enum_name()
             if nullable:
                 # For nullable enum, return Result<Option<Enum>>
-                return f'''    if let {match_pattern} = inp {{
-        Ok({enum_name}::from_u8(*v as u8))
-    }} else {{
-        Ok(None)
-    }}'''
+                return _SINGLE_VALUE_MATCH_TMPL.format(pattern=match_pattern, ok=f'Ok({enum_name}::from_u8(*v as u8))', fallback='Ok(None)')
             else:
                 # For non-nullable enum, return Result<Enum>
-                return f'''    if let {match_pattern} = inp {{
-        {enum_name}::from_u8(*v as u8).ok_or_else(|| anyhow::anyhow!("Invalid enum value"))
-    }} else {{
-        Err(anyhow::anyhow!("Expected Integer"))
-    }}'''
+                return _SINGLE_VALUE_MATCH_TMPL.format(
+                    pattern=match_pattern,
+                    ok=f'{enum_name}::from_u8(*v as u8).ok_or_else(|| anyhow::anyhow!("Invalid enum value"))',
+                    fallback='Err(anyhow::anyhow!("Expected Integer"))',
+                )
         # Check if this is a bitmap type
         elif attr_type.endswith('Bitmap') and bitmaps and attr_type in bitmaps:
-            bitmap_obj = bitmaps[attr_type]
-            bitmap_name = bitmap_obj.get_rust_bitmap_name()
-            base_type = bitmap_obj.get_base_type()
+            base_type = bitmaps[attr_type].get_base_type()
             if nullable:
                 # For nullable bitmap, return Result<Option<Bitmap>>
-                return f'''    if let {match_pattern} = inp {{
-        Ok(Some(*v as {base_type}))
-    }} else {{
-        Ok(None)
-    }}'''
+                return _SINGLE_VALUE_MATCH_TMPL.format(pattern=match_pattern, ok=f'Ok(Some(*v as {base_type}))', fallback='Ok(None)')
             else:
                 # For non-nullable bitmap, return Result<Bitmap>
-                return f'''    if let {match_pattern} = inp {{
-        Ok(*v as {base_type})
-    }} else {{
-        Err(anyhow::anyhow!("Expected Integer"))
-    }}'''
+                return _SINGLE_VALUE_MATCH_TMPL.format(pattern=match_pattern, ok=f'Ok(*v as {base_type})', fallback='Err(anyhow::anyhow!("Expected Integer"))')
         else:
             # Regular integer type
             value_expr = _get_value_cast_expr('*v', attr_type, enums, bitmaps)
     else:
         # Unsupported type
+        return _UNSUPPORTED_SINGLE_VALUE_DECODERS[nullable]
+
+    key = (tlv_type, value_expr, nullable)
+    decoder = _int_value_decoder_cache.get(key)
+    if decoder is None:
+        # Wrap the value expression based on nullable
         if nullable:
-            return '    // TODO: Handle nullable custom type decoding\n    Ok(None)'
+            decoder = _SINGLE_VALUE_MATCH_TMPL.format(pattern=match_pattern, ok=f'Ok(Some({value_expr}))', fallback='Ok(None)')
         else:
-            return '    // TODO: Handle custom type decoding\n    Err(anyhow::anyhow!("Unsupported type"))'
+            decoder = _SINGLE_VALUE_MATCH_TMPL.format(pattern=match_pattern, ok=f'Ok({value_expr})', fallback=f'Err(anyhow::anyhow!("Expected {tlv_type}"))')
+        _int_value_decoder_cache[key] = decoder
+    return decoder
 
-    # Wrap the value expression based on nullable
-    if nullable:
-        return f'''    if let {match_pattern} = inp {{
-        Ok(Some({value_expr}))
-    }} else {{
-        Ok(None)
-    }}'''
-    else:
-        return f'''    if let {match_pattern} = inp {{
-        Ok({value_expr})
-    }} else {{
-        Err(anyhow::anyhow!("Expected {tlv_type}"))
-    }}'''
+
+@lru_cache(maxsize=None)
+def _struct_type_rust_name(struct_type: str) -> str:
+    """PascalCase Rust name for a struct type referenced by name only.
+
+    Drops the "Struct" suffix and keeps the capitalized words; the same few
+    struct names come up for every field referencing them.
+    """
+    return ''.join(PASCAL_SPLIT.findall(struct_type.replace('Struct', '')))
 
 
-def _generate_rust_struct_definition(struct_name: str, struct_fields: List[Tuple[int, str, str, Optional[str]]], structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
+def _generate_rust_struct_definition(struct_name: str, struct_fields: List['MatterField'], structs: Optional[Dict[str, 'MatterStruct']] = None, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
     """Generate a Rust struct definition with optional fields.
 
     This is shared between MatterStruct and MatterCommandResponse to avoid duplication.
 
     Args:
         struct_name: The name of the struct (already in PascalCase)
-        struct_fields: List of (id, name, type, entry_type) tuples
+        struct_fields: The struct's fields
         structs: Dictionary of struct definitions
         enums: Dictionary of enum definitions
         bitmaps: Dictionary of bitmap definitions
@@ -277,9 +401,11 @@ def _generate_rust_struct_definition(struct_name: str, struct_fields: List[Tuple
         String containing the complete struct definition
     """
     field_definitions = []
-    for field_id, field_name, field_type, entry_type in struct_fields:
-        rust_field_name = convert_to_snake_case(field_name)
-        rust_field_name = escape_rust_keyword(rust_field_name)
+    for field in struct_fields:
+        field_id = field.id
+        field_type = field.field_type
+        entry_type = field.entry_type
+        rust_field_name = field.get_rust_param_name()
 
         if field_type == 'list' and entry_type:
             # Handle list fields with specific entry types
@@ -288,9 +414,7 @@ def _generate_rust_struct_definition(struct_name: str, struct_fields: List[Tuple
                 if structs and entry_type not in structs:
                     continue
                 # Custom struct type - convert to PascalCase
-                entry_rust_type = entry_type.replace('Struct', '')
-                entry_rust_type = ''.join(word.capitalize() for word in re.findall(r'[A-Z][a-z]*', entry_rust_type))
-                rust_type = f"Vec<{entry_rust_type}>"
+                rust_type = f"Vec<{_struct_type_rust_name(entry_type)}>"
             else:
                 # Primitive type or known type
                 entry_rust_type = MatterType.get_rust_type(entry_type, enums=enums, bitmaps=bitmaps)
@@ -305,8 +429,7 @@ def _generate_rust_struct_definition(struct_name: str, struct_fields: List[Tuple
                 rust_type = structs[field_type].get_rust_struct_name()
             else:
                 # Fallback: convert struct name
-                rust_type = field_type.replace('Struct', '')
-                rust_type = ''.join(word.capitalize() for word in re.findall(r'[A-Z][a-z]*', rust_type))
+                rust_type = _struct_type_rust_name(field_type)
         else:
             rust_type = MatterType.get_rust_type(field_type, enums=enums, bitmaps=bitmaps)
 
@@ -330,16 +453,129 @@ pub struct {struct_name} {{
 }}'''
 
 
-def _generate_struct_field_assignments(struct_fields: List[Tuple[int, str, str, Optional[str]]], structs: Dict[str, 'MatterStruct'], enums: Dict[str, 'MatterEnum'], item_var: str, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> List[str]:
+# Scalar field types decoded with a dedicated TlvItem getter
+_SCALAR_FIELD_GETTERS = {
+    'string': 'get_string_owned',
+    'bool':   'get_bool',
+    'octstr': 'get_octet_string_owned',
+}
+
+# Scalar field types encoded from an `x` binding, by TlvItemValueEnc variant
+_SCALAR_FIELD_ENCODERS = {
+    'string': 'String(x.clone())',
+    'octstr': 'OctetString(x.clone())',
+    'bool':   'Bool(x)',
+}
+
+
+# Struct field assignment templates, rendered with str.format. {name} is the
+# Rust field name; {value}, {int}, {field} and {child} are the field lookups
+# built by _field_lookup.
+_VALUE_FIELD_TMPL = "                {name}: {value},"
+
+_INT_FIELD_TMPL = "                {name}: {int}.map(|v| v as {rust_type}),"
+
+_ENUM_FIELD_TMPL = "                {name}: {int}.and_then(|v| {enum_name}::from_u8(v as u8)),"
+
+# {decode_call} decodes the element bound to `list_item`
+_STRUCT_LIST_FIELD_TMPL = '''                {name}: {{
+                    if let Some(tlv::TlvItemValue::List(l)) = {field} {{
+                        let mut items = Vec::with_capacity(l.len());
+                        for list_item in l {{
+                            items.push({decode_call});
+                        }}
+                        Some(items)
+                    }} else {{
+                        None
+                    }}
+                }},'''
+
+# Borrows the tagged child item directly rather than cloning its value into a
+# synthetic TlvItem; {decode_call} decodes `nested_item`
+_NESTED_STRUCT_FIELD_TMPL = '''                {name}: {{
+                    if let Some(nested_item @ tlv::TlvItem {{ value: tlv::TlvItemValue::List(_), .. }}) = {child} {{
+                        Some({decode_call})
+                    }} else {{
+                        None
+                    }}
+                }},'''
+
+
+def _field_lookup(item_var: str, field_id: Union[int, str], method: str, slots: Optional[Dict[Union[int, str], int]]) -> str:
+    """Return the Rust expression calling TlvItem `method` for field `field_id`.
+
+    Without `slots` this looks the tag up in `item_var`. With `slots` the field's
+    element comes from the `fields` array filled by a single scan of the list
+    (see `_field_slot_scan`); the tag gets the next free slot on first use.
+    """
+    if slots is None:
+        return f"{item_var}.{method}(&[{field_id}])"
+    slot = slots.setdefault(field_id, len(slots))
+    if method == 'get_item':
+        return f"fields[{slot}]"
+    return f"fields[{slot}].and_then(|c| c.{method}(&[]))"
+
+
+def _field_slot_scan(slots: Dict[Union[int, str], int], depth: int) -> str:
+    """Render the loop over the element list `l` that fills the `fields` array.
+
+    `slots` is the tag -> slot mapping filled by `_field_lookup`; each slot
+    keeps the first element with its tag, like TlvItem::get.
+    """
+    ind = _IND[depth]
+    arms = "\n".join(f"{ind}        {tag} => {slot}," for tag, slot in slots.items())
+    return f'''{ind}for e in l {{
+{ind}    let slot = match e.tag {{
+{arms}
+{ind}        _ => continue,
+{ind}    }};
+{ind}    if fields[slot].is_none() {{
+{ind}        fields[slot] = Some(e);
+{ind}    }}
+{ind}}}'''
+
+
+# Command response / event decoder; the struct literal reads its fields from
+# the element list bound by the if-let, through {scan} when any are read
+_LIST_VALUE_DECODER_TMPL = '''{doc}
+pub fn {func_name}(inp: &tlv::TlvItemValue) -> anyhow::Result<{struct_name}> {{
+    if let tlv::TlvItemValue::List({binding}) = inp {{
+{scan}        Ok({struct_name} {{
+{assignments}
+        }})
+    }} else {{
+        Err(anyhow::anyhow!("Expected struct fields"))
+    }}
+}}'''
+
+
+def _render_list_value_decoder(doc: str, func_name: str, struct_name: str, assignments: str, slots: Dict[Union[int, str], int]) -> str:
+    """Render a response or event decoder around assignments built with `slots`."""
+    if slots:
+        binding = 'l'
+        scan = (f"        let mut fields: [Option<&tlv::TlvItem>; {len(slots)}] = [None; {len(slots)}];\n"
+                f"{_field_slot_scan(slots, 2)}\n")
+    else:
+        binding = '_fields'
+        scan = ''
+    return _LIST_VALUE_DECODER_TMPL.format(doc=doc, func_name=func_name, struct_name=struct_name,
+                                           binding=binding, scan=scan, assignments=assignments)
+
+
+def _generate_struct_field_assignments(struct_fields: List['MatterField'], structs: Dict[str, 'MatterStruct'], enums: Dict[str, 'MatterEnum'], item_var: str, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None, slots: Optional[Dict[Union[int, str], int]] = None) -> List[str]:
     """Generate Rust field assignments for a struct from a TLV item.
 
     Fields with undefined cross-cluster struct types are skipped to match
-    the struct definition generation logic.
+    the struct definition generation logic. When `slots` is given, fields are
+    read from the single-scan `fields` array instead (see `_field_lookup`) and
+    `slots` is filled with the tag -> slot mapping used.
     """
     field_assignments = []
-    for field_id, field_name, field_type, entry_type in struct_fields:
-        rust_field_name = convert_to_snake_case(field_name)
-        rust_field_name = escape_rust_keyword(rust_field_name)
+    for field in struct_fields:
+        field_id = field.id
+        field_type = field.field_type
+        entry_type = field.entry_type
+        rust_field_name = field.get_rust_param_name()
 
         # Skip fields with undefined cross-cluster struct types (consistent with struct generation)
         if field_type.endswith('Struct') and structs and field_type not in structs:
@@ -347,90 +583,63 @@ def _generate_struct_field_assignments(struct_fields: List[Tuple[int, str, str,
         if field_type == 'list' and entry_type and entry_type.endswith('Struct') and structs and entry_type not in structs:
             continue  # List of cross-cluster struct references, skip
 
-        if field_type == 'list' and entry_type:
-            if entry_type.endswith('Struct') and structs and entry_type in structs:
-                target_struct = structs[entry_type]
-                struct_rust_name = target_struct.get_rust_struct_name()
-                nested_assignments_str = "\n".join(_generate_struct_field_assignments(target_struct.fields, structs, enums, "list_item", bitmaps))
-                field_assignments.append(f'''                {rust_field_name}: {{
-                    if let Some(tlv::TlvItemValue::List(l)) = {item_var}.get(&[{field_id}]) {{
-                        let mut items = Vec::new();
-                        for list_item in l {{
-                            items.push({struct_rust_name} {{
-{nested_assignments_str}
-                            }});
-                        }}
-                        Some(items)
-                    }} else {{
-                        None
-                    }}
-                }},''')
+        getter = _SCALAR_FIELD_GETTERS.get(field_type)
+        if getter is not None:
+            field_assignments.append(_VALUE_FIELD_TMPL.format(name=rust_field_name, value=_field_lookup(item_var, field_id, getter, slots)))
+        elif field_type == 'list' and entry_type:
+            if entry_type.endswith('Struct') and structs and (entry_struct := structs.get(entry_type)) is not None:
+                decode_call = _struct_decoder_call(entry_struct, "&list_item.value", structs, enums, bitmaps)
+                field_assignments.append(_STRUCT_LIST_FIELD_TMPL.format(name=rust_field_name, field=_field_lookup(item_var, field_id, 'get', slots), decode_call=decode_call))
             elif entry_type.endswith('Struct'):
                 field_assignments.append(f"                {rust_field_name}: None, // TODO: Implement {entry_type} list decoding")
             else:
-                rust_type = MatterType.get_rust_type(entry_type, enums=enums, bitmaps=bitmaps)
-                value_map = _generate_list_item_filter_expr(entry_type, enums=enums, bitmaps=bitmaps)
-
-                field_assignments.append(f'''                {rust_field_name}: {{
-                    if let Some(tlv::TlvItemValue::List(l)) = {item_var}.get(&[{field_id}]) {{
-                        let items: Vec<{rust_type}> = l.iter().filter_map(|e| {{ {value_map} }}).collect();
-                        Some(items)
-                    }} else {{
-                        None
-                    }}
-                }},''')
+                template = _LIST_PRIMITIVE_TEMPLATES.get(entry_type)
+                if template is None:
+                    template = _list_entry_type_cache.get(entry_type)
+                    if template is None:
+                        template = _list_entry_type_cache[entry_type] = _list_helper_template(entry_type, enums=enums, bitmaps=bitmaps) or ''
+                field_value = _field_lookup(item_var, field_id, 'get', slots)
+                if template:
+                    field_assignments.append(template.format(name=rust_field_name, field=field_value))
+                else:
+                    rust_type = MatterType.get_rust_type(entry_type, enums=enums, bitmaps=bitmaps)
+                    value_map = _generate_list_item_filter_expr(entry_type, enums=enums, bitmaps=bitmaps)
+                    field_assignments.append(_list_primitive_field_assignment(rust_field_name, field_value, rust_type, value_map))
         elif is_numeric_or_id_type(field_type):
-            from ..naming import build_numeric_field_assignment
-            field_assignments.append(build_numeric_field_assignment(rust_field_name, field_id, field_type, enums=enums, indent='                ', item_var=item_var))
-        elif field_type == 'string':
-            field_assignments.append(f"                {rust_field_name}: {item_var}.get_string_owned(&[{field_id}]),")
-        elif field_type == 'bool':
-            field_assignments.append(f"                {rust_field_name}: {item_var}.get_bool(&[{field_id}]),")
-        elif field_type == 'octstr':
-            field_assignments.append(f"                {rust_field_name}: {item_var}.get_octet_string_owned(&[{field_id}]),")
+            int_value = _field_lookup(item_var, field_id, 'get_int', slots)
+            rust_type = MatterType.get_rust_type(field_type, enums=enums)
+            if rust_type == 'u64':
+                field_assignments.append(_VALUE_FIELD_TMPL.format(name=rust_field_name, value=int_value))
+            else:
+                field_assignments.append(_INT_FIELD_TMPL.format(name=rust_field_name, int=int_value, rust_type=rust_type))
         elif field_type.endswith('Enum'):
+            int_value = _field_lookup(item_var, field_id, 'get_int', slots)
             # Check if we have the enum definition
             if enums and field_type in enums:
                 enum_name = enums[field_type].get_rust_enum_name()
-                field_assignments.append(f"                {rust_field_name}: {item_var}.get_int(&[{field_id}]).and_then(|v| {enum_name}::from_u8(v as u8)),")
+                field_assignments.append(_ENUM_FIELD_TMPL.format(name=rust_field_name, int=int_value, enum_name=enum_name))
             else:
                 # Fallback to u8 if enum not defined
-                field_assignments.append(f"                {rust_field_name}: {item_var}.get_int(&[{field_id}]).map(|v| v as u8),")
+                field_assignments.append(_INT_FIELD_TMPL.format(name=rust_field_name, int=int_value, rust_type='u8'))
         elif field_type.endswith('Bitmap'):
+            int_value = _field_lookup(item_var, field_id, 'get_int', slots)
             # Check if we have the bitmap definition
             if bitmaps and field_type in bitmaps:
-                bitmap_obj = bitmaps[field_type]
-                bitmap_name = bitmap_obj.get_rust_bitmap_name()
-                base_type = bitmap_obj.get_base_type()
-                field_assignments.append(f"                {rust_field_name}: {item_var}.get_int(&[{field_id}]).map(|v| v as {base_type}),")
+                base_type = bitmaps[field_type].get_base_type()
+                field_assignments.append(_INT_FIELD_TMPL.format(name=rust_field_name, int=int_value, rust_type=base_type))
             else:
                 # Fallback to u8 if bitmap not defined
-                field_assignments.append(f"                {rust_field_name}: {item_var}.get_int(&[{field_id}]).map(|v| v as u8),")
-        elif field_type.endswith('Struct') and structs and field_type in structs:
+                field_assignments.append(_INT_FIELD_TMPL.format(name=rust_field_name, int=int_value, rust_type='u8'))
+        elif field_type.endswith('Struct') and structs and (nested_struct := structs.get(field_type)) is not None:
             # In-cluster struct - generate nested struct decoding
-            target_struct = structs[field_type]
-            struct_rust_name = target_struct.get_rust_struct_name()
-            nested_assignments_str = "\n".join(_generate_struct_field_assignments(target_struct.fields, structs, enums, "nested_item", bitmaps))
-            field_assignments.append(f'''                {rust_field_name}: {{
-                    if let Some(nested_tlv) = {item_var}.get(&[{field_id}]) {{
-                        if let tlv::TlvItemValue::List(_) = nested_tlv {{
-                            let nested_item = tlv::TlvItem {{ tag: {field_id}, value: nested_tlv.clone() }};
-                            Some({struct_rust_name} {{
-{nested_assignments_str}
-                            }})
-                        }} else {{
-                            None
-                        }}
-                    }} else {{
-                        None
-                    }}
-                }},''')
+            decode_call = _struct_decoder_call(nested_struct, "&nested_item.value", structs, enums, bitmaps)
+            field_assignments.append(_NESTED_STRUCT_FIELD_TMPL.format(name=rust_field_name, child=_field_lookup(item_var, field_id, 'get_item', slots), decode_call=decode_call))
         elif field_type.endswith('Struct'):
             # Cross-cluster struct not in current cluster - skip this field
             pass
         else:
             # Default fallback
-            field_assignments.append(f"                {rust_field_name}: {item_var}.get_int(&[{field_id}]).map(|v| v as u8),")
+            field_assignments.append(_INT_FIELD_TMPL.format(name=rust_field_name, int=_field_lookup(item_var, field_id, 'get_int', slots), rust_type='u8'))
 
     return field_assignments
 
@@ -444,8 +653,9 @@ def _generate_single_field_encoding(
     structs: Dict[str, 'MatterStruct'],
     enums: Dict[str, 'MatterEnum'],
     bitmaps: Optional[Dict[str, 'MatterBitmap']] = None,
-    indent: str = "        ",
-    fields_vec: str = "fields"
+    depth: int = 2,
+    fields_vec: str = "fields",
+    out: Optional[List[str]] = None
 ) -> List[str]:
     """Generate encoding lines for a single struct field.
 
@@ -458,20 +668,45 @@ def _generate_single_field_encoding(
         structs: Dictionary of struct definitions
         enums: Dictionary of enum definitions
         bitmaps: Dictionary of bitmap definitions
-        indent: Indentation string for generated code
+        depth: Indentation level (in 4-space steps) of the generated code
         fields_vec: Name of the vector to push to (default: 'fields')
+        out: Buffer to append to; nested struct fields are written into the
+            same buffer instead of being built up and copied level by level
 
     Returns:
-        List of code lines (without trailing newlines)
+        The buffer holding the code lines (without trailing newlines); a new
+        list when `out` is not given. Skipped fields append nothing.
     """
-    lines = []
+    lines = [] if out is None else out
+    key = (field_id, rust_field, field_type, field_entry, value_path, depth, fields_vec)
+    cached = _field_encoding_cache.get(key)
+    if cached is None:
+        cached = _field_encoding_cache[key] = tuple(_encode_single_field(
+            field_id, rust_field, field_type, field_entry, value_path, structs, enums, bitmaps, depth, fields_vec, []
+        ))
+    lines.extend(cached)
+    return lines
 
-    if field_type == 'string':
-        lines.append(f"{indent}if let Some(x) = {value_path}.{rust_field} {{ {fields_vec}.push(({field_id}, tlv::TlvItemValueEnc::String(x.clone())).into()); }}")
-    elif field_type == 'octstr':
-        lines.append(f"{indent}if let Some(x) = {value_path}.{rust_field} {{ {fields_vec}.push(({field_id}, tlv::TlvItemValueEnc::OctetString(x.clone())).into()); }}")
-    elif field_type == 'bool':
-        lines.append(f"{indent}if let Some(x) = {value_path}.{rust_field} {{ {fields_vec}.push(({field_id}, tlv::TlvItemValueEnc::Bool(x)).into()); }}")
+
+def _encode_single_field(
+    field_id: int,
+    rust_field: str,
+    field_type: str,
+    field_entry: Optional[str],
+    value_path: str,
+    structs: Dict[str, 'MatterStruct'],
+    enums: Dict[str, 'MatterEnum'],
+    bitmaps: Optional[Dict[str, 'MatterBitmap']],
+    depth: int,
+    fields_vec: str,
+    lines: List[str]
+) -> List[str]:
+    """Append the encoding lines for one struct field to `lines`; see _generate_single_field_encoding."""
+    indent = _IND[depth]
+
+    scalar_enc = _SCALAR_FIELD_ENCODERS.get(field_type)
+    if scalar_enc is not None:
+        lines.append(f"{indent}if let Some(x) = {value_path}.{rust_field} {{ {fields_vec}.push(({field_id}, tlv::TlvItemValueEnc::{scalar_enc}).into()); }}")
     elif is_numeric_or_id_type(field_type) or field_type.endswith('Enum') or field_type.endswith('Bitmap'):
         tlv_type = MatterType.get_tlv_type(field_type, bitmaps=bitmaps)
         cast = _get_value_cast_expr('x', field_type, enums, bitmaps)
@@ -480,23 +715,14 @@ def _generate_single_field_encoding(
         # Handle list fields
         # Skip lists of cross-cluster struct references
         if field_entry.endswith('Struct') and (not structs or field_entry not in structs):
-            return []  # Return empty list to signal skip
+            return lines  # Nothing appended signals skip
         entry_tlv = MatterType.get_tlv_type(field_entry, bitmaps=bitmaps)
         entry_rust = MatterType.get_rust_type(field_entry, enums=enums, bitmaps=bitmaps)
-        if field_entry.endswith('Struct') and structs and field_entry in structs:
-            nested = structs[field_entry]
-            nested_lines = []
-            for nf_id, nf_name, nf_type, nf_entry in nested.fields:
-                nf_rust_field = escape_rust_keyword(convert_to_snake_case(nf_name))
-                field_lines = _generate_single_field_encoding(
-                    nf_id, nf_rust_field, nf_type, nf_entry, 'inner', structs, enums, bitmaps,
-                    indent + "            ", 'nested_fields'
-                )
-                nested_lines.extend(field_lines)
+        if field_entry.endswith('Struct') and structs and (nested := structs.get(field_entry)) is not None:
             lines.append(f"{indent}if let Some(listv) = {value_path}.{rust_field} {{")
             lines.append(f"{indent}    let inner_vec: Vec<_> = listv.into_iter().map(|inner| {{")
             lines.append(f"{indent}        let mut nested_fields = Vec::new();")
-            lines.extend(nested_lines)
+            _generate_struct_fields_encoding(nested, 'inner', structs, enums, bitmaps, depth + 3, 'nested_fields', lines)
             lines.append(f"{indent}        (0, tlv::TlvItemValueEnc::StructAnon(nested_fields)).into()")
             lines.append(f"{indent}    }}).collect();")
             lines.append(f"{indent}    {fields_vec}.push(({field_id}, tlv::TlvItemValueEnc::Array(inner_vec)).into());")
@@ -507,35 +733,53 @@ def _generate_single_field_encoding(
             lines.append(f"{indent}if let Some(listv) = {value_path}.{rust_field} {{ {fields_vec}.push(({field_id}, tlv::TlvItemValueEnc::StructAnon(listv.into_iter().map(|x| (0, tlv::TlvItemValueEnc::OctetString(x.clone())).into()).collect())).into()); }}")
         elif entry_tlv == 'Bool':
             lines.append(f"{indent}if let Some(listv) = {value_path}.{rust_field} {{ {fields_vec}.push(({field_id}, tlv::TlvItemValueEnc::StructAnon(listv.into_iter().map(|x| (0, tlv::TlvItemValueEnc::Bool(x)).into()).collect())).into()); }}")
-        elif entry_tlv.startswith('UInt') or entry_tlv.startswith('Int'):
+        elif entry_tlv in _INT_TLV_TYPES:
             cast = _get_value_cast_expr('x', field_entry, enums, bitmaps)
             lines.append(f"{indent}if let Some(listv) = {value_path}.{rust_field} {{ {fields_vec}.push(({field_id}, tlv::TlvItemValueEnc::StructAnon(listv.into_iter().map(|x| (0, tlv::TlvItemValueEnc::{entry_tlv}({cast})).into()).collect())).into()); }}")
         else:
             lines.append(f"{indent}// TODO: encoding for list field {rust_field} ({field_entry}) not implemented")
-    elif field_type.endswith('Struct') and structs and field_type in structs:
+    elif field_type.endswith('Struct') and structs and (nested := structs.get(field_type)) is not None:
         # Nested struct - generate encoding recursively
-        nested = structs[field_type]
         # Use unique variable name to avoid conflicts with parent scope
         nested_vec_name = f'{rust_field}_nested_fields'
         lines.append(f'{indent}if let Some(inner) = {value_path}.{rust_field} {{')
         lines.append(f'{indent}    let mut {nested_vec_name} = Vec::new();')
-        for nf_id, nf_name, nf_type, nf_entry in nested.fields:
-            nf_rust_field = escape_rust_keyword(convert_to_snake_case(nf_name))
-            nested_lines = _generate_single_field_encoding(
-                nf_id, nf_rust_field, nf_type, nf_entry, 'inner', structs, enums, bitmaps, indent + "    ", nested_vec_name
-            )
-            lines.extend(nested_lines)
+        _generate_struct_fields_encoding(nested, 'inner', structs, enums, bitmaps, depth + 1, nested_vec_name, lines)
         lines.append(f'{indent}    {fields_vec}.push(({field_id}, tlv::TlvItemValueEnc::StructInvisible({nested_vec_name})).into());')
         lines.append(f'{indent}}}')
     elif field_type.endswith('Struct'):
         # Cross-cluster struct - skip
-        return []  # Return empty list to signal skip
+        return lines  # Nothing appended signals skip
     else:
         lines.append(f"{indent}// TODO: encoding for field {rust_field} ({field_type}) not implemented")
 
     return lines
 
 
+def _generate_struct_fields_encoding(
+    struct: 'MatterStruct',
+    value_path: str,
+    structs: Dict[str, 'MatterStruct'],
+    enums: Dict[str, 'MatterEnum'],
+    bitmaps: Optional[Dict[str, 'MatterBitmap']],
+    depth: int,
+    fields_vec: str,
+    out: List[str]
+) -> List[str]:
+    """Append the encoding lines for every field of `struct` held in `value_path` to `out`."""
+    key = (struct.name, value_path, depth, fields_vec)
+    lines = _struct_encoding_cache.get(key)
+    if lines is None:
+        lines = []
+        for f in struct.fields:
+            _generate_single_field_encoding(
+                f.id, f.get_rust_param_name(), f.field_type, f.entry_type, value_path, structs, enums, bitmaps, depth, fields_vec, lines
+            )
+        _struct_encoding_cache[key] = lines
+    out.extend(lines)
+    return out
+
+
 def _push_from_element(element_str: str) -> str:
     """Convert an encoded TLV element string (e.g. '(tag, value).into(),') into a tlv_fields.push() call."""
     return f"tlv_fields.push({element_str.strip().rstrip(',')});"
@@ -561,15 +805,14 @@ def generate_optional_field_push(field: 'MatterField', param_name: str, structs:
     if field_type.endswith('Struct'):
         if not structs or field_type not in structs:
             return ""  # Cross-cluster struct - skip
-        encoding_result = generate_field_tlv_encoding(field, bare_name, structs, enums, bitmaps)
-        if not encoding_result:
+        pre_lines, element = generate_field_tlv_encoding(field, bare_name, structs, enums, bitmaps)
+        if not element:
             return ""
-        # Multi-line struct encoder: pre-statements + final element line.
+        # Struct encoder: pre-statements + final element line.
         # Re-indent each line to 8 spaces (one level deeper than the if-let block at 4 spaces)
         # and convert the trailing element to a push call.
-        lines = encoding_result.split('\n')
-        body_lines = [ln.lstrip() for ln in lines[:-1]]
-        push_line = _push_from_element(lines[-1])
+        body_lines = [ln.lstrip() for ln in pre_lines]
+        push_line = _push_from_element(element)
         body = "\n        ".join(body_lines + [push_line])
         return f"if let Some({bare_name}) = {param_name} {{\n        {body}\n    }}"
 
@@ -577,12 +820,12 @@ def generate_optional_field_push(field: 'MatterField', param_name: str, structs:
     if field.is_list:
         if field.entry_type and field.entry_type.endswith('Struct') and (not structs or field.entry_type not in structs):
             return ""  # Cross-cluster struct entry - skip
-        encoding_result = generate_field_tlv_encoding(field, bare_name, structs, enums, bitmaps)
-        if not encoding_result:
+        _, element = generate_field_tlv_encoding(field, bare_name, structs, enums, bitmaps)
+        if not element:
             return ""
         # List encoder returns a single expression (possibly multi-line for struct entries).
         # Strip the leading 8-space indent on the first line and convert to push.
-        push_line = _push_from_element(encoding_result.lstrip())
+        push_line = _push_from_element(element.lstrip())
         return f"if let Some({bare_name}) = {param_name} {{\n        {push_line}\n    }}"
 
     # Scalar types
@@ -606,7 +849,20 @@ def generate_optional_field_push(field: 'MatterField', param_name: str, structs:
         return f"// TODO: optional field {field.name} (tag {field_id}) type {field_type} encoding not implemented"
 
 
-def generate_field_tlv_encoding(field: 'MatterField', param_name: str, structs: Dict[str, 'MatterStruct'], enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
+# Command parameter list of primitives, encoded with a presized push loop into
+# an anonymous struct; {value} is the element expression for `v`
+_LIST_PARAM_ENC_TMPL = "        {{ let mut items = Vec::with_capacity({param}.len()); for v in {param} {{ items.push((0, tlv::TlvItemValueEnc::{variant}({value})).into()); }} ({id}, tlv::TlvItemValueEnc::StructAnon(items)).into() }},"
+
+# Command parameter list of in-cluster structs; {body} pushes the present
+# fields of `v` into `fields`
+_STRUCT_LIST_PARAM_ENC_TMPL = """        ({id}, tlv::TlvItemValueEnc::Array({param}.into_iter().map(|v| {{
+                    let mut fields = Vec::new();
+{body}
+                    (0, tlv::TlvItemValueEnc::StructAnon(fields)).into()
+                }}).collect())).into(),"""
+
+
+def generate_field_tlv_encoding(field: 'MatterField', param_name: str, structs: Dict[str, 'MatterStruct'], enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> Tuple[List[str], str]:
     """Generate TLV encoding line for a field.
 
     This function generates Rust code to encode a Matter field into TLV format.
@@ -620,35 +876,25 @@ def generate_field_tlv_encoding(field: 'MatterField', param_name: str, structs:
         bitmaps: Dictionary of bitmap definitions for proper type conversion
 
     Returns:
-        String containing Rust code for encoding this field, or empty string if field should be skipped
+        (pre_statements, element): statements that must run before the field
+        list (struct fields build their value first) and the vec![] element
+        encoding this field, or ([], "") if the field should be skipped
     """
     if field.is_list:
         if field.entry_type:
             # Skip lists of cross-cluster struct references
             if field.entry_type.endswith('Struct') and (not structs or field.entry_type not in structs):
-                return ""  # Skip this field
+                return [], ""  # Skip this field
             # If the entry is a struct and we have its definition, generate
             # code that accepts `Vec<Struct>` and encodes each struct's
             # present fields into a TLV anonymous struct element.
-            if field.entry_type.endswith('Struct') and structs and field.entry_type in structs:
-                target = structs[field.entry_type]
-                struct_rust_name = target.get_rust_struct_name()
-                # Build per-field push statements for the inner struct
-                inner_lines = []
-                for f_id, f_name, f_type, f_entry in target.fields:
-                    rust_field = escape_rust_keyword(convert_to_snake_case(f_name))
-                    field_lines = _generate_single_field_encoding(
-                        f_id, rust_field, f_type, f_entry, 'v', structs, enums, bitmaps,
-                        "                    "
-                    )
-                    inner_lines.extend(field_lines)
-
-                inner_body = "\n".join(inner_lines)
-                # Generate the final map/collect expression with correct closure
-                # Note: the opening brace after |v| opens the closure body
-                closure_start = f"        ({field.id}, tlv::TlvItemValueEnc::Array({param_name}.into_iter().map(|v| " + "{\n"
-                closure_end = "                }).collect())).into(),"
-                return closure_start + "                    let mut fields = Vec::new();\n" + inner_body + "\n                    (0, tlv::TlvItemValueEnc::StructAnon(fields)).into()\n" + closure_end
+            if field.entry_type.endswith('Struct') and structs and (target := structs.get(field.entry_type)) is not None:
+                # Per-field push statements for the inner struct
+                body = _struct_list_body_cache.get(target.name)
+                if body is None:
+                    inner_lines = _generate_struct_fields_encoding(target, 'v', structs, enums, bitmaps, 5, 'fields', [])
+                    body = _struct_list_body_cache[target.name] = "\n".join(inner_lines)
+                return [], _STRUCT_LIST_PARAM_ENC_TMPL.format(id=field.id, param=param_name, body=body)
 
             # Primitive entry types: map Matter TLV type to the correct
             # TlvItemValueEnc variant and cast elements to the appropriate
@@ -657,50 +903,43 @@ def generate_field_tlv_encoding(field: 'MatterField', param_name: str, structs:
             entry_rust = MatterType.get_rust_type(field.entry_type, enums=enums, bitmaps=bitmaps)
 
             if entry_tlv == 'String':
-                return f"        ({field.id}, tlv::TlvItemValueEnc::StructAnon({param_name}.into_iter().map(|v| (0, tlv::TlvItemValueEnc::String(v)).into()).collect())).into(),"
+                return [], _LIST_PARAM_ENC_TMPL.format(id=field.id, param=param_name, variant='String', value='v')
             if entry_tlv == 'OctetString':
-                return f"        ({field.id}, tlv::TlvItemValueEnc::StructAnon({param_name}.into_iter().map(|v| (0, tlv::TlvItemValueEnc::OctetString(v)).into()).collect())).into(),"
+                return [], _LIST_PARAM_ENC_TMPL.format(id=field.id, param=param_name, variant='OctetString', value='v')
             if entry_tlv == 'Bool':
-                return f"        ({field.id}, tlv::TlvItemValueEnc::StructAnon({param_name}.into_iter().map(|v| (0, tlv::TlvItemValueEnc::Bool(v)).into()).collect())).into(),"
-            if entry_tlv.startswith('UInt') or entry_tlv.startswith('Int'):
+                return [], _LIST_PARAM_ENC_TMPL.format(id=field.id, param=param_name, variant='Bool', value='v')
+            if entry_tlv in _INT_TLV_TYPES:
                 # Cast numeric items to the target Rust type when necessary
                 cast = _get_value_cast_expr('v', field.entry_type, enums, bitmaps)
-                return f"        ({field.id}, tlv::TlvItemValueEnc::StructAnon({param_name}.into_iter().map(|v| (0, tlv::TlvItemValueEnc::{entry_tlv}({cast})).into()).collect())).into(),"
+                return [], _LIST_PARAM_ENC_TMPL.format(id=field.id, param=param_name, variant=entry_tlv, value=cast)
 
             # Fallback: preserve previous behavior but use the element as-is
-            return f"        ({field.id}, tlv::TlvItemValueEnc::StructAnon({param_name}.into_iter().map(|v| (0, tlv::TlvItemValueEnc::UInt8(v)).into()).collect())).into(),"
+            return [], _LIST_PARAM_ENC_TMPL.format(id=field.id, param=param_name, variant='UInt8', value='v')
         else:
             # No entry type specified — keep previous default (UInt8)
-            return f"        ({field.id}, tlv::TlvItemValueEnc::StructAnon({param_name}.into_iter().map(|v| (0, tlv::TlvItemValueEnc::UInt8(v)).into()).collect())).into(),"
+            return [], _LIST_PARAM_ENC_TMPL.format(id=field.id, param=param_name, variant='UInt8', value='v')
 
     tlv_type = MatterType.get_tlv_type(field.field_type, bitmaps=bitmaps)
 
     if field.nullable:
         # Handle nullable fields
-        if field.field_type.endswith('Struct') and structs and field.field_type in structs:
+        if field.field_type.endswith('Struct') and structs and (struct_def := structs.get(field.field_type)) is not None:
             # Handle nullable struct fields - encode if Some, otherwise use empty struct
-            struct_def = structs[field.field_type]
             lines = []
             lines.append(f"        // Encode optional struct {field.field_type}")
             lines.append(f"        let {param_name}_enc = if let Some(s) = {param_name} {{")
             lines.append(f"            let mut fields = Vec::new();")
-
-            for f_id, f_name, f_type, f_entry in struct_def.fields:
-                rust_field = escape_rust_keyword(convert_to_snake_case(f_name))
-                field_lines = _generate_single_field_encoding(
-                    f_id, rust_field, f_type, f_entry, 's', structs, enums, bitmaps, "            "
-                )
-                lines.extend(field_lines)
+            _generate_struct_fields_encoding(struct_def, 's', structs, enums, bitmaps, 3, 'fields', lines)
 
             lines.append(f"            tlv::TlvItemValueEnc::StructInvisible(fields)")
             lines.append(f"        }} else {{")
             lines.append(f"            tlv::TlvItemValueEnc::StructInvisible(Vec::new())")
             lines.append(f"        }};")
             lines.append(f"        ({field.id}, {param_name}_enc).into(),")
-            return "\n".join(lines)
+            return lines[:-1], lines[-1]
         elif field.field_type.endswith('Struct'):
             # Struct type not defined in this cluster - skip
-            return ""
+            return [], ""
 
         # For Enum types, use proper conversion
         if field.field_type.endswith('Enum'):
@@ -744,7 +983,7 @@ def generate_field_tlv_encoding(field: 'MatterField', param_name: str, structs:
                 default_value = field._get_default_value(enums, bitmaps)
                 param_expr = f"{param_name}.unwrap_or({default_value})"
 
-        return f"        ({field.id}, tlv::TlvItemValueEnc::{tlv_type}({param_expr})).into(),"
+        return [], f"        ({field.id}, tlv::TlvItemValueEnc::{tlv_type}({param_expr})).into(),"
     else:
         # For non-nullable Enum types, use proper conversion
         if field.field_type.endswith('Enum'):
@@ -754,7 +993,7 @@ def generate_field_tlv_encoding(field: 'MatterField', param_name: str, structs:
             else:
                 # Fallback: assume it's already u8
                 param_expr = param_name
-            return f"        ({field.id}, tlv::TlvItemValueEnc::{tlv_type}({param_expr})).into(),"
+            return [], f"        ({field.id}, tlv::TlvItemValueEnc::{tlv_type}({param_expr})).into(),"
         # For non-nullable Bitmap types, use proper conversion
         elif field.field_type.endswith('Bitmap'):
             # Check if we have the bitmap definition
@@ -763,10 +1002,9 @@ def generate_field_tlv_encoding(field: 'MatterField', param_name: str, structs:
             else:
                 # Fallback: assume it's already the base type
                 param_expr = param_name
-            return f"        ({field.id}, tlv::TlvItemValueEnc::{tlv_type}({param_expr})).into(),"
-        elif field.field_type.endswith('Struct') and structs and field.field_type in structs:
+            return [], f"        ({field.id}, tlv::TlvItemValueEnc::{tlv_type}({param_expr})).into(),"
+        elif field.field_type.endswith('Struct') and structs and (struct_def := structs.get(field.field_type)) is not None:
             # Single struct parameter - need to encode its fields
-            struct_def = structs[field.field_type]
             lines = []
             lines.append(f"        // Encode struct {field.field_type}")
 
@@ -779,11 +1017,10 @@ def generate_field_tlv_encoding(field: 'MatterField', param_name: str, structs:
             # Track if any field is actually encoded (not TODO)
             has_encodable_fields = False
 
-            for f_id, f_name, f_type, f_entry in struct_def.fields:
-                rust_field = escape_rust_keyword(convert_to_snake_case(f_name))
+            for f in struct_def.fields:
                 field_lines = _generate_single_field_encoding(
-                    f_id, rust_field, f_type, f_entry, param_name, structs, enums, bitmaps,
-                    "        ", var_name
+                    f.id, f.get_rust_param_name(), f.field_type, f.entry_type, param_name, structs, enums, bitmaps,
+                    2, var_name
                 )
                 # Check if this field is actually encodable (not a TODO comment)
                 if field_lines and not any('TODO' in line for line in field_lines):
@@ -796,7 +1033,7 @@ def generate_field_tlv_encoding(field: 'MatterField', param_name: str, structs:
                 lines[2] = f"        let {var_name}: Vec<tlv::TlvItemEnc> = Vec::new();  // Empty struct"
 
             lines.append(f"        ({field.id}, tlv::TlvItemValueEnc::StructInvisible({var_name})).into(),")
-            return "\n".join(lines)
+            return lines[:-1], lines[-1]
         else:
             param_expr = param_name
-            return f"        ({field.id}, tlv::TlvItemValueEnc::{tlv_type}({param_expr})).into(),"
+            return [], f"        ({field.id}, tlv::TlvItemValueEnc::{tlv_type}({param_expr})).into(),"
@@ -6,20 +6,21 @@ This module provides functions for converting between naming conventions
 """
 
 import re
-from typing import Dict, Optional, TYPE_CHECKING
+import sys
+from functools import lru_cache
+from typing import Dict, Optional, Set, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from type_mapping import MatterType
-    from models.enums import MatterEnum
 
 
 # Set of numeric and ID types in Matter specification
 # Derived from TYPE_MAP - includes all types that map to integer Rust types
 # This includes both ID types (devtype-id, cluster-id, etc.) and base enum/bitmap types (enum8, enum16, bitmap8, etc.)
-def _build_numeric_or_id_types():
+def _build_numeric_or_id_types() -> Set[str]:
     """Build set of numeric/ID types from TYPE_MAP."""
     from .type_mapping import MatterType
-    numeric_types = set()
+    numeric_types: Set[str] = set()
     # Exclude only non-numeric primitive types and the bare integer types handled by prefix check
     excluded = {'bool', 'string', 'octstr', 'list',
                 'uint8', 'uint16', 'uint32', 'uint64',
@@ -32,33 +33,30 @@ def _build_numeric_or_id_types():
 
     return numeric_types
 
-NUMERIC_OR_ID_TYPES = _build_numeric_or_id_types()
+NUMERIC_OR_ID_TYPES = frozenset(map(sys.intern, _build_numeric_or_id_types()))
+
+# Bare integer types (the spec also defines the odd widths uint24/int40/...),
+# merged with the ID types so the predicate below is a single set lookup
+_NUMERIC_TYPES = frozenset(
+    sys.intern(f'{sign}int{bits}') for sign in ('u', '') for bits in range(8, 65, 8)
+) | NUMERIC_OR_ID_TYPES
 
 
 def is_numeric_or_id_type(t: str) -> bool:
     """Return True if the Matter type is numeric or a well-known ID type."""
-    return t.startswith('uint') or t.startswith('int') or t in NUMERIC_OR_ID_TYPES
-
-
-def build_numeric_field_assignment(
-    var_name: str,
-    field_id: int,
-    matter_type: str,
-    enums: Optional[Dict[str, 'MatterEnum']] = None,
-    indent: str = '                ',
-    item_var: str = 'item'
-) -> str:
-    """Generate Rust code snippet for assigning a numeric/ID field with proper casting."""
-    # Import here to avoid circular dependency at module load time
-    from .type_mapping import MatterType
+    return t in _NUMERIC_TYPES
+
 
-    rust_type = MatterType.get_rust_type(matter_type, enums=enums)
-    if rust_type == 'u64':
-        return f"{indent}{var_name}: {item_var}.get_int(&[{field_id}]),"
-    else:
-        return f"{indent}{var_name}: {item_var}.get_int(&[{field_id}]).map(|v| v as {rust_type}),"
+# Word boundaries used by convert_to_snake_case
+_ACRONYM_BOUNDARY = re.compile(r'([A-Z]+)([A-Z][a-z])')
+_CAMEL_BOUNDARY = re.compile(r'([a-z\d])([A-Z])')
+_UNDERSCORE_RUN = re.compile(r'_+')
 
+# Capitalized words of a PascalCase name
+PASCAL_SPLIT = re.compile(r'[A-Z][a-z]*')
 
+
+@lru_cache(maxsize=None)
 def convert_to_snake_case(name: str) -> str:
     """
     Convert CamelCase to snake_case with proper handling of abbreviations.
@@ -101,18 +99,19 @@ def convert_to_snake_case(name: str) -> str:
         name = name.replace(old, new)
 
     # Handle sequences of uppercase letters followed by lowercase (e.g., XMLHttp -> XML_Http)
-    name = re.sub(r'([A-Z]+)([A-Z][a-z])', r'\1_\2', name)
+    name = _ACRONYM_BOUNDARY.sub(r'\1_\2', name)
 
     # Handle lowercase followed by uppercase (e.g., getHTTP -> get_HTTP)
-    name = re.sub(r'([a-z\d])([A-Z])', r'\1_\2', name)
+    name = _CAMEL_BOUNDARY.sub(r'\1_\2', name)
 
     # Clean up any multiple underscores and convert to lowercase
-    name = re.sub(r'_+', '_', name).lower()
+    name = _UNDERSCORE_RUN.sub('_', name).lower()
 
     # Remove leading/trailing underscores
     return name.strip('_')
 
 
+@lru_cache(maxsize=None)
 def convert_to_pascal_case(name: str) -> str:
     """
     Convert a name (either already PascalCase or snake_case) to PascalCase.
@@ -129,6 +128,18 @@ def convert_to_pascal_case(name: str) -> str:
     return ''.join(word.capitalize() for word in name.split('_'))
 
 
+# Rust keywords that need to be escaped when used as identifiers
+_RUST_KEYWORDS = frozenset({
+    'as', 'break', 'const', 'continue', 'crate', 'else', 'enum', 'extern',
+    'false', 'fn', 'for', 'if', 'impl', 'in', 'let', 'loop', 'match', 'mod',
+    'move', 'mut', 'pub', 'ref', 'return', 'self', 'Self', 'static', 'struct',
+    'super', 'trait', 'true', 'type', 'unsafe', 'use', 'where', 'while',
+    'async', 'await', 'dyn', 'abstract', 'become', 'box', 'do', 'final',
+    'macro', 'override', 'priv', 'typeof', 'unsized', 'virtual', 'yield',
+    'try', 'union'
+})
+
+
 def escape_rust_keyword(name: str) -> str:
     """
     Escape Rust keywords by appending '_' suffix.
@@ -138,18 +149,7 @@ def escape_rust_keyword(name: str) -> str:
     - match -> match_
     - if -> if_
     """
-    # List of Rust keywords that need to be escaped
-    rust_keywords = {
-        'as', 'break', 'const', 'continue', 'crate', 'else', 'enum', 'extern',
-        'false', 'fn', 'for', 'if', 'impl', 'in', 'let', 'loop', 'match', 'mod',
-        'move', 'mut', 'pub', 'ref', 'return', 'self', 'Self', 'static', 'struct',
-        'super', 'trait', 'true', 'type', 'unsafe', 'use', 'where', 'while',
-        'async', 'await', 'dyn', 'abstract', 'become', 'box', 'do', 'final',
-        'macro', 'override', 'priv', 'typeof', 'unsized', 'virtual', 'yield',
-        'try', 'union'
-    }
-
-    if name in rust_keywords:
+    if name in _RUST_KEYWORDS:
         return f"{name}_"
     return name
 
@@ -167,6 +167,7 @@ def _make_identifier(name: str) -> str:
     return name.replace(' ', '_').replace('.', '_').replace('-', '_').replace('/', '_')
 
 
+@lru_cache(maxsize=None)
 def upper_ident(name: str) -> str:
     """Uppercase identifier fragment used in `defs.rs` constants.
 
@@ -5,37 +5,51 @@ This module contains high-level functions that coordinate the code generation
 process: parsing XML files, generating Rust code, and creating module files.
 """
 
-import xml.etree.ElementTree as ET
+import hashlib
+import io
+import json
 import os
 import sys
 import glob
 import re
-from typing import Dict, List, Optional
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO, Tuple
 
 from .naming import convert_to_snake_case, upper_ident
-from .xml_parser import ClusterParser
+from .xml_parser import ClusterParser, parse_xml_bytes, scan_typedefs
 from .models import MatterStruct, AttributeField, MatterField
 from .models.facade import emit_command_facade, emit_attribute_facade
+from .models.tlv_helpers import reset_decoder_registry, take_struct_decoders
+
+
+def _unique_by_id(attributes: List[AttributeField]) -> List[AttributeField]:
+    """Return the attributes with duplicate IDs dropped, keeping the first of each."""
+    seen_ids = set()
+    unique = []
+    for attribute in attributes:
+        if attribute.id not in seen_ids:
+            seen_ids.add(attribute.id)
+            unique.append(attribute)
+    return unique
 
 
 def generate_json_dispatcher_function(cluster_id: str, attributes: List[AttributeField], structs: Dict[str, MatterStruct]) -> str:
-    """Generate a JSON dispatcher function that routes attribute decoding based on attribute ID."""
+    """Generate a JSON dispatcher function that routes attribute decoding based on attribute ID.
+
+    `attributes` must already be deduplicated by ID (see _unique_by_id).
+    """
     if not attributes:
         return ""
 
     clean_cluster_id = cluster_id
 
-    # Generate match arms for each unique attribute (deduplicate by ID)
+    # Generate one match arm per attribute
     match_arms = []
-    seen_ids = set()
     for attribute in attributes:
         clean_attr_id = attribute.id
-
-        # Skip duplicates
-        if clean_attr_id in seen_ids:
-            continue
-        seen_ids.add(clean_attr_id)
-
         func_name = attribute.get_rust_function_name()
 
         # Check if this is a list of octstr attribute
@@ -97,22 +111,19 @@ pub fn decode_attribute_json(cluster_id: u32, attribute_id: u32, tlv_value: &cra
 
 
 def generate_attribute_list_function(cluster_id: str, attributes: List[AttributeField]) -> str:
-    """Generate a function that returns all attributes for this cluster as a list."""
+    """Generate a function that returns all attributes for this cluster as a list.
+
+    `attributes` must already be deduplicated by ID (see _unique_by_id).
+    """
     if not attributes:
         return ""
 
     # Generate attribute list entries
     attribute_entries = []
-    seen_ids = set()
 
     for attribute in attributes:
         clean_attr_id = attribute.id
 
-        # Skip duplicates
-        if clean_attr_id in seen_ids:
-            continue
-        seen_ids.add(clean_attr_id)
-
         # Create attribute entry with ID and name
         attribute_entries.append(f'        ({clean_attr_id}, "{attribute.name}"),')
     entries_str = "\n".join(attribute_entries)
@@ -205,7 +216,7 @@ pub fn get_event_list() -> Vec<(u32, &'static str)> {{
 '''
 
 
-def _resolve_field_typedefs(fields, typedefs: Dict[str, str]) -> None:
+def _resolve_field_typedefs(fields: List[MatterField], typedefs: Dict[str, str]) -> None:
     """Resolve typedef names in MatterField objects to their base types in-place."""
     for field in fields:
         if field.field_type in typedefs:
@@ -214,9 +225,21 @@ def _resolve_field_typedefs(fields, typedefs: Dict[str, str]) -> None:
             field.entry_type = typedefs[field.entry_type]
 
 
-def generate_rust_code(xml_file: str, typedefs: Optional[Dict[str, str]] = None) -> str:
-    """Generate Rust code for the given XML cluster file."""
-    parser = ClusterParser(xml_file)
+def generate_rust_code(xml_file: str, typedefs: Optional[Dict[str, str]] = None, tree=None) -> str:
+    """Generate Rust code for the given XML cluster file.
+
+    `tree` is the already parsed file, if the caller has it; otherwise
+    xml_file is parsed here.
+    """
+    out = io.StringIO()
+    write_rust_code(xml_file, out, typedefs, tree)
+    return out.getvalue()
+
+
+def write_rust_code(xml_file: str, out: TextIO, typedefs: Optional[Dict[str, str]] = None, tree=None) -> None:
+    """Generate Rust code for the given XML cluster file, writing it to `out` as it is produced."""
+    parser = ClusterParser(xml_file, tree)
+    reset_decoder_registry()
     commands = parser.parse_commands()
     attributes = parser.parse_attributes()
     response_commands = parser.parse_response_commands()
@@ -224,6 +247,9 @@ def generate_rust_code(xml_file: str, typedefs: Optional[Dict[str, str]] = None)
     structs = parser.parse_structs()
     enums = parser.parse_enums()
     bitmaps = parser.parse_bitmaps()
+    facade_cluster_name = parser.parse_facade_cluster_name()
+    # Everything needed has been extracted; free the DOM before emitting code
+    parser.release()
 
     # Resolve <number> typedefs to base types so existing helpers handle them correctly
     if typedefs:
@@ -292,8 +318,8 @@ def generate_rust_code(xml_file: str, typedefs: Optional[Dict[str, str]] = None)
     # Also check if any struct field references LocationDescriptorStruct
     if not location_needed:
         for struct in structs.values():
-            for field_id, field_name, field_type, entry_type in struct.fields:
-                if field_type == 'LocationDescriptorStruct' or entry_type == 'LocationDescriptorStruct':
+            for field in struct.fields:
+                if field.field_type == 'LocationDescriptorStruct' or field.entry_type == 'LocationDescriptorStruct':
                     location_needed = True
                     break
             if location_needed:
@@ -311,7 +337,7 @@ def generate_rust_code(xml_file: str, typedefs: Optional[Dict[str, str]] = None)
     cluster_name_snake = parser.cluster_name.lower().replace(' ', '_').replace('-', '_')
 
     # Generate imports based on what we're generating
-    imports = ""
+    import_lines: List[str] = []
     # Check if we have commands with fields (not field-less commands)
     commands_with_fields = [cmd for cmd in commands if cmd.fields]
     # Check if we have response commands with fields
@@ -320,11 +346,11 @@ def generate_rust_code(xml_file: str, typedefs: Optional[Dict[str, str]] = None)
     events_with_fields = [evt for evt in events if evt.fields]
     # tlv is only needed for commands, attributes, response commands, events, and structs (not enums)
     if commands_with_fields or attributes or response_commands_with_fields or events_with_fields or structs:
-        imports += "use crate::tlv;\n"
+        import_lines.append("use crate::tlv;\n")
     if commands_with_fields or commands or attributes or response_commands_with_fields or events_with_fields:
-        imports += "use anyhow;\n"
+        import_lines.append("use anyhow;\n")
     if attributes or commands or events:
-        imports += "use serde_json;\n"
+        import_lines.append("use serde_json;\n")
 
     # Check which specific serialization helpers are needed
     needs_opt_bytes_hex = False
@@ -332,33 +358,34 @@ def generate_rust_code(xml_file: str, typedefs: Optional[Dict[str, str]] = None)
 
     if structs:
         for struct in structs.values():
-            for field_id, field_name, field_type, entry_type in struct.fields:
+            for field in struct.fields:
                 # Single octstr field needs serialize_opt_bytes_as_hex
-                if field_type == 'octstr':
+                if field.field_type == 'octstr':
                     needs_opt_bytes_hex = True
                 # List of octstr field needs serialize_opt_vec_bytes_as_hex
-                elif field_type == 'list' and entry_type == 'octstr':
+                elif field.field_type == 'list' and field.entry_type == 'octstr':
                     needs_opt_vec_bytes_hex = True
 
     # Also check response commands for octstr fields
     if response_commands:
         for response in response_commands:
-            for field_id, field_name, field_type, entry_type in response.fields:
-                if field_type == 'octstr':
+            for field in response.fields:
+                if field.field_type == 'octstr':
                     needs_opt_bytes_hex = True
-                elif field_type == 'list' and entry_type == 'octstr':
+                elif field.field_type == 'list' and field.entry_type == 'octstr':
                     needs_opt_vec_bytes_hex = True
 
     # Also check events for octstr fields
     if events:
         for event in events:
-            for field_id, field_name, field_type, entry_type in event.fields:
-                if field_type == 'octstr':
+            for field in event.fields:
+                if field.field_type == 'octstr':
                     needs_opt_bytes_hex = True
-                elif field_type == 'list' and entry_type == 'octstr':
+                elif field.field_type == 'list' and field.entry_type == 'octstr':
                     needs_opt_vec_bytes_hex = True
 
-    code = f'''//! Matter TLV encoders and decoders for {parser.cluster_name}
+    imports = "".join(import_lines)
+    out.write(f'''//! Matter TLV encoders and decoders for {parser.cluster_name}
 //! Cluster ID: {parser.cluster_id}
 //!
 //! This file is automatically generated from {os.path.basename(xml_file)}
@@ -367,7 +394,7 @@ def generate_rust_code(xml_file: str, typedefs: Optional[Dict[str, str]] = None)
 
 {imports}
 
-'''
+''')
 
     # Import only the specific serialization helpers that are needed
     if needs_opt_bytes_hex or needs_opt_vec_bytes_hex:
@@ -378,33 +405,36 @@ def generate_rust_code(xml_file: str, typedefs: Optional[Dict[str, str]] = None)
             helpers_to_import.append('serialize_opt_vec_bytes_as_hex')
 
         helpers_import = ', '.join(helpers_to_import)
-        code += f'''// Import serialization helpers for octet strings
+        out.write(f'''// Import serialization helpers for octet strings
 use crate::clusters::helpers::{{{helpers_import}}};
 
-'''
+''')
 
     # Generate enum definitions (before structs as structs may use enums)
     if enums:
-        code += "// Enum definitions\n\n"
+        out.write("// Enum definitions\n\n")
         for enum in enums.values():
-            code += enum.generate_rust_enum() + "\n\n"
+            enum.write_to(out)
+            out.write("\n\n")
 
     # Generate bitmap definitions (after enums, before structs)
     # Uses shared crate::clusters::bitmap::Bitmap<Tag, Base> type
     if bitmaps:
-        code += "// Bitmap definitions\n\n"
+        out.write("// Bitmap definitions\n\n")
         for bitmap in bitmaps.values():
-            code += bitmap.generate_rust_bitmap() + "\n\n"
+            bitmap.write_to(out)
+            out.write("\n\n")
 
     # Generate struct definitions
     if structs:
-        code += "// Struct definitions\n\n"
+        out.write("// Struct definitions\n\n")
         for struct in structs.values():
-            code += struct.generate_rust_struct(structs, enums, bitmaps) + "\n\n"
+            out.write(struct.generate_rust_struct(structs, enums, bitmaps))
+            out.write("\n\n")
 
     # Generate command encoders
     if commands:
-        code += "// Command encoders\n\n"
+        out.write("// Command encoders\n\n")
         generated_functions = set()
         for command in commands:
             # Skip commands with no fields - they don't need encoders
@@ -413,30 +443,52 @@ use crate::clusters::helpers::{{{helpers_import}}};
 
             func_name = command.get_rust_function_name()
             if func_name not in generated_functions:
-                code += command.generate_rust_function(structs, enums, bitmaps) + "\n\n"
+                out.write(command.generate_rust_function(structs, enums, bitmaps))
+                out.write("\n\n")
                 generated_functions.add(func_name)
 
     # Generate attribute decoders
     if attributes:
-        code += "// Attribute decoders\n\n"
-        generated_functions = set()
+        out.write("// Attribute decoders\n\n")
+        # One decoder per function name; attributes that share a signature
+        # (type, nullability, list entry) forward to a single shared body
+        decoded_attributes = {}
         for attribute in attributes:
-            func_name = attribute.get_rust_function_name()
-            if func_name not in generated_functions:
-                code += attribute.generate_decode_function(structs, enums, bitmaps) + "\n\n"
-                generated_functions.add(func_name)
+            decoded_attributes.setdefault(attribute.get_rust_function_name(), attribute)
+        signature_counts = Counter(a.decode_signature for a in decoded_attributes.values())
+        shared_names = {a.get_shared_decoder_name() for a in decoded_attributes.values()
+                        if signature_counts[a.decode_signature] > 1}
+        # Never let a shared decoder shadow an attribute's own decoder
+        shared_names.difference_update(decoded_attributes)
+
+        generated_shared = set()
+        for attribute in decoded_attributes.values():
+            shared_name = attribute.get_shared_decoder_name()
+            if shared_name not in shared_names:
+                out.write(attribute.generate_decode_function(structs, enums, bitmaps))
+                out.write("\n\n")
+                continue
+            if shared_name not in generated_shared:
+                out.write(attribute.generate_shared_decode_function(structs, enums, bitmaps))
+                out.write("\n\n")
+                generated_shared.add(shared_name)
+            out.write(attribute.generate_decode_wrapper(structs, enums, bitmaps))
+            out.write("\n\n")
+
+        # Both dispatchers list each attribute ID once
+        unique_attributes = _unique_by_id(attributes)
 
         # Generate JSON dispatcher function
-        code += generate_json_dispatcher_function(parser.cluster_id, attributes, structs)
+        out.write(generate_json_dispatcher_function(parser.cluster_id, unique_attributes, structs))
 
         # Generate attribute list function
-        code += generate_attribute_list_function(parser.cluster_id, attributes)
+        out.write(generate_attribute_list_function(parser.cluster_id, unique_attributes))
 
     # Generate command schema and JSON encoder
     if commands:
-        code += generate_command_list_function(commands)
-        code += generate_command_schema_function(commands, enums, bitmaps, structs)
-        code += generate_command_json_encoder_function(commands, structs, enums, bitmaps)
+        out.write(generate_command_list_function(commands))
+        out.write(generate_command_schema_function(commands, enums, bitmaps, structs))
+        out.write(generate_command_json_encoder_function(commands, structs, enums, bitmaps))
 
     # Generate command response decoders
     if response_commands:
@@ -447,52 +499,40 @@ use crate::clusters::helpers::{{{helpers_import}}};
                 continue
             struct_name = response.get_rust_struct_name()
             if struct_name not in response_structs_generated:
-                code += response.generate_rust_struct(structs, enums, bitmaps) + "\n\n"
+                out.write(response.generate_rust_struct(structs, enums, bitmaps))
+                out.write("\n\n")
                 response_structs_generated.add(struct_name)
 
         # Then generate response decode functions
         if response_structs_generated:
-            code += "// Command response decoders\n\n"
+            out.write("// Command response decoders\n\n")
         generated_functions = set()
         for response in response_commands:
             if not response.fields:
                 continue
             func_name = f"decode_{convert_to_snake_case(response.name)}"
             if func_name not in generated_functions:
-                code += response.generate_decode_function(structs, enums, bitmaps) + "\n\n"
+                out.write(response.generate_decode_function(structs, enums, bitmaps))
+                out.write("\n\n")
                 generated_functions.add(func_name)
 
-    # Generate typed facade (invokes + reads). Matches defs.rs constant naming
-    # by using the <clusterIds><clusterId name=...> attribute, not the root
-    # element's name attribute (which often has a " Cluster" suffix). When an
-    # XML defines multiple clusters (e.g. ResourceMonitoring), gen2.py only
-    # emits CLUSTER_{name}_ATTR_ID_ / CMD_ID_ constants for the LAST cluster,
-    # so the facade must use the last clusterId too. Abstract/base clusters
-    # (AlarmBase, ModeBase, ...) have <clusterId> with no id attribute and get
-    # no defs constants - skip facade emission for those files.
-    facade_cluster_name = None
-    cluster_ids_elem = parser.root.find('clusterIds')
-    if cluster_ids_elem is not None:
-        concrete_ids = [ci for ci in cluster_ids_elem.findall('clusterId') if ci.get('id')]
-        if concrete_ids:
-            facade_cluster_name = concrete_ids[-1].get('name')
-
+    # Generate typed facade (invokes + reads), skipped for abstract clusters
     if facade_cluster_name:
         cluster_upper = upper_ident(facade_cluster_name)
 
         response_by_name = {resp.name: resp for resp in response_commands}
 
-        facade_code = ""
+        facade_code = io.StringIO()
         emitted_fns = set()
         for command in commands:
             fn_name = f"cmd:{command.name}"
             if fn_name in emitted_fns:
                 continue
             emitted_fns.add(fn_name)
-            facade_code += emit_command_facade(
+            facade_code.write(emit_command_facade(
                 command, cluster_upper, facade_cluster_name,
                 structs, enums, bitmaps, response_by_name,
-            )
+            ))
 
         emitted_attr_fns = set()
         for attribute in attributes:
@@ -500,14 +540,14 @@ use crate::clusters::helpers::{{{helpers_import}}};
             if key in emitted_attr_fns:
                 continue
             emitted_attr_fns.add(key)
-            facade_code += emit_attribute_facade(
+            facade_code.write(emit_attribute_facade(
                 attribute, cluster_upper, facade_cluster_name,
                 structs, enums, bitmaps,
-            )
+            ))
 
-        if facade_code:
-            code += "// Typed facade (invokes + reads)\n\n"
-            code += facade_code
+        if facade_code.tell():
+            out.write("// Typed facade (invokes + reads)\n\n")
+            out.write(facade_code.getvalue())
 
     # Generate event decoders
     if events:
@@ -518,25 +558,37 @@ use crate::clusters::helpers::{{{helpers_import}}};
                 continue
             struct_name = event.get_rust_struct_name()
             if struct_name not in event_structs_generated:
-                code += event.generate_rust_struct(structs, enums, bitmaps) + "\n\n"
+                out.write(event.generate_rust_struct(structs, enums, bitmaps))
+                out.write("\n\n")
                 event_structs_generated.add(struct_name)
 
         # Then generate event decode functions
         if event_structs_generated:
-            code += "// Event decoders\n\n"
+            out.write("// Event decoders\n\n")
         generated_functions = set()
         for event in events:
             if not event.fields:
                 continue
             func_name = f"decode_{convert_to_snake_case(event.name)}_event"
             if func_name not in generated_functions:
-                code += event.generate_decode_function(structs, enums, bitmaps) + "\n\n"
+                out.write(event.generate_decode_function(structs, enums, bitmaps))
+                out.write("\n\n")
                 generated_functions.add(func_name)
 
-        code += generate_event_json_dispatcher_function(parser.cluster_id, events)
-        code += generate_event_list_function(parser.cluster_id, events)
+        out.write(generate_event_json_dispatcher_function(parser.cluster_id, events))
+        out.write(generate_event_list_function(parser.cluster_id, events))
+
+    # Emit the shared struct decoders requested by the decoders above, once each
+    struct_decoders = take_struct_decoders()
+    if struct_decoders:
+        out.write("// Struct decoders\n\n")
+        for decoder in struct_decoders:
+            out.write(decoder)
+            out.write("\n\n")
 
-    return code
+
+_NON_IDENT_CHARS = re.compile(r'[^a-z0-9_]')
+_UNDERSCORE_RUN = re.compile(r'_+')
 
 
 def generate_rust_filename(xml_filename: str) -> str:
@@ -548,8 +600,8 @@ def generate_rust_filename(xml_filename: str) -> str:
     result = convert_to_snake_case(base_name)
 
     # Handle special characters that might remain
-    result = re.sub(r'[^a-z0-9_]', '_', result)
-    result = re.sub(r'_+', '_', result).strip('_')
+    result = _NON_IDENT_CHARS.sub('_', result)
+    result = _UNDERSCORE_RUN.sub('_', result).strip('_')
 
     return f"{result}.rs"
 
@@ -571,6 +623,15 @@ def get_cluster_id(root) -> str:
     return root.get('id', '0x0000')
 
 
+def _clusters_with(cluster_info: List[Dict[str, str]], flag: str) -> List[Dict[str, str]]:
+    """Return the clusters whose `flag` is set, sorted by ID, first one per cluster ID."""
+    unique: Dict[str, Dict[str, str]] = {}
+    for info in sorted(cluster_info, key=lambda x: x['cluster_id']):
+        if info.get(flag):
+            unique.setdefault(info['cluster_id'], info)
+    return list(unique.values())
+
+
 def _generate_cluster_dispatcher(cluster_info: List[Dict[str, str]], dispatcher_type: str) -> str:
     """Generate a cluster dispatcher function (either command or attribute).
 
@@ -611,14 +672,10 @@ def _generate_cluster_dispatcher(cluster_info: List[Dict[str, str]], dispatcher_
         error_msg = "vec![]"
 
     # Build match arms for each cluster that has attributes, avoiding duplicates
-    seen_cluster_ids = set()
-    match_arms = []
-
-    for info in sorted(cluster_info, key=lambda x: x['cluster_id']):
-        if info['has_attributes'] and info['cluster_id'] not in seen_cluster_ids:
-            match_arms.append(f"        {info['cluster_id']} => {info['module_name']}::{function_call},")
-            seen_cluster_ids.add(info['cluster_id'])
-    match_arms_str = '\n'.join(match_arms)
+    match_arms_str = '\n'.join(
+        f"        {info['cluster_id']} => {info['module_name']}::{function_call},"
+        for info in _clusters_with(cluster_info, 'has_attributes')
+    )
 
     dispatcher_function = f'''
 /// {doc_title}
@@ -647,16 +704,10 @@ def generate_main_attribute_list_dispatcher(cluster_info: List[Dict[str, str]])
 
 def generate_main_event_dispatcher(cluster_info: List[Dict[str, str]]) -> str:
     """Generate the main decode_event_json dispatcher function."""
-    seen_cluster_ids = set()
-    match_arms = []
-    for info in sorted(cluster_info, key=lambda x: x['cluster_id']):
-        if info.get('has_events') and info['cluster_id'] not in seen_cluster_ids:
-            mod = info['module_name']
-            match_arms.append(
-                f"        {info['cluster_id']} => {mod}::decode_event_json(cluster_id, event_id, tlv_value),"
-            )
-            seen_cluster_ids.add(info['cluster_id'])
-    match_arms_str = '\n'.join(match_arms)
+    match_arms_str = '\n'.join(
+        f"        {info['cluster_id']} => {info['module_name']}::decode_event_json(cluster_id, event_id, tlv_value),"
+        for info in _clusters_with(cluster_info, 'has_events')
+    )
 
     return f'''
 /// Main dispatcher for decoding event TLV values to JSON strings
@@ -671,15 +722,10 @@ pub fn decode_event_json(cluster_id: u32, event_id: u32, tlv_value: &crate::tlv:
 
 def generate_main_event_list_dispatcher(cluster_info: List[Dict[str, str]]) -> str:
     """Generate the main get_event_list dispatcher function."""
-    seen_cluster_ids = set()
-    match_arms = []
-    for info in sorted(cluster_info, key=lambda x: x['cluster_id']):
-        if info.get('has_events') and info['cluster_id'] not in seen_cluster_ids:
-            match_arms.append(
-                f"        {info['cluster_id']} => {info['module_name']}::get_event_list(),"
-            )
-            seen_cluster_ids.add(info['cluster_id'])
-    match_arms_str = '\n'.join(match_arms)
+    match_arms_str = '\n'.join(
+        f"        {info['cluster_id']} => {info['module_name']}::get_event_list(),"
+        for info in _clusters_with(cluster_info, 'has_events')
+    )
 
     return f'''/// Main dispatcher for getting event lists by cluster ID
 pub fn get_event_list(cluster_id: u32) -> Vec<(u32, &\'static str)> {{
@@ -1072,27 +1118,13 @@ def generate_command_json_encoder_function(commands, structs, enums, bitmaps) ->
 
 def _generate_command_dispatchers(cluster_info: List[Dict]) -> str:
     """Generate cross-cluster command dispatchers for mod.rs."""
-    seen: set = set()
-    list_arms = []
-    name_arms = []
-    schema_arms = []
-    encoder_arms = []
+    clusters = [(info['cluster_id'], info['module_name'])
+                for info in _clusters_with(cluster_info, 'has_commands')]
 
-    for info in sorted(cluster_info, key=lambda x: x['cluster_id']):
-        cid = info['cluster_id']
-        mod = info['module_name']
-        if not info.get('has_commands', False) or cid in seen:
-            continue
-        seen.add(cid)
-        list_arms.append(f'        {cid} => {mod}::get_command_list(),')
-        name_arms.append(f'        {cid} => {mod}::get_command_name(cmd_id),')
-        schema_arms.append(f'        {cid} => {mod}::get_command_schema(cmd_id),')
-        encoder_arms.append(f'        {cid} => {mod}::encode_command_json(cmd_id, args),')
-
-    list_arms_str = '\n'.join(list_arms)
-    name_arms_str = '\n'.join(name_arms)
-    schema_arms_str = '\n'.join(schema_arms)
-    encoder_arms_str = '\n'.join(encoder_arms)
+    list_arms_str = '\n'.join(f'        {cid} => {mod}::get_command_list(),' for cid, mod in clusters)
+    name_arms_str = '\n'.join(f'        {cid} => {mod}::get_command_name(cmd_id),' for cid, mod in clusters)
+    schema_arms_str = '\n'.join(f'        {cid} => {mod}::get_command_schema(cmd_id),' for cid, mod in clusters)
+    encoder_arms_str = '\n'.join(f'        {cid} => {mod}::encode_command_json(cmd_id, args),' for cid, mod in clusters)
 
     return f'''
 pub fn get_command_list(cluster_id: u32) -> Vec<(u32, &'static str)> {{
@@ -1357,61 +1389,315 @@ pub fn get_opt_octstr(args: &serde_json::Value, name: &str) -> anyhow::Result<Op
 '''
 
 
+_LIST_UTIL_RS = '''\
+// Helper functions for decoding lists of primitive values, shared by the
+// generated struct decoders. Each takes the field looked up with
+// TlvItem::get and returns None when it is missing or is not a list.
+
+use crate::tlv;
+
+/// Decode a list field, keeping the elements `conv` accepts.
+pub fn decode_list_with<T>(
+    field: Option<&tlv::TlvItemValue>,
+    conv: impl Fn(&tlv::TlvItemValue) -> Option<T>,
+) -> Option<Vec<T>> {
+    if let Some(tlv::TlvItemValue::List(l)) = field {
+        let mut items = Vec::with_capacity(l.len());
+        for e in l {
+            if let Some(v) = conv(&e.value) {
+                items.push(v);
+            }
+        }
+        Some(items)
+    } else {
+        None
+    }
+}
+
+/// Decode a list of integers, keeping the values `conv` accepts.
+pub fn decode_int_list_with<T>(
+    field: Option<&tlv::TlvItemValue>,
+    conv: impl Fn(u64) -> Option<T>,
+) -> Option<Vec<T>> {
+    decode_list_with(field, |v| {
+        if let tlv::TlvItemValue::Int(v) = v {
+            conv(*v)
+        } else {
+            None
+        }
+    })
+}
+
+macro_rules! int_list_decoder {
+    ($name:ident, $t:ty) => {
+        pub fn $name(field: Option<&tlv::TlvItemValue>) -> Option<Vec<$t>> {
+            decode_int_list_with(field, |v| Some(v as $t))
+        }
+    };
+}
+
+int_list_decoder!(decode_u8_list, u8);
+int_list_decoder!(decode_u16_list, u16);
+int_list_decoder!(decode_u32_list, u32);
+int_list_decoder!(decode_u64_list, u64);
+int_list_decoder!(decode_i8_list, i8);
+int_list_decoder!(decode_i16_list, i16);
+int_list_decoder!(decode_i32_list, i32);
+int_list_decoder!(decode_i64_list, i64);
+
+pub fn decode_bool_list(field: Option<&tlv::TlvItemValue>) -> Option<Vec<bool>> {
+    decode_list_with(field, |v| {
+        if let tlv::TlvItemValue::Bool(v) = v {
+            Some(*v)
+        } else {
+            None
+        }
+    })
+}
+
+pub fn decode_string_list(field: Option<&tlv::TlvItemValue>) -> Option<Vec<String>> {
+    decode_list_with(field, |v| {
+        if let tlv::TlvItemValue::String(v) = v {
+            Some(v.clone())
+        } else {
+            None
+        }
+    })
+}
+
+pub fn decode_octet_string_list(field: Option<&tlv::TlvItemValue>) -> Option<Vec<Vec<u8>>> {
+    decode_list_with(field, |v| {
+        if let tlv::TlvItemValue::OctetString(v) = v {
+            Some(v.clone())
+        } else {
+            None
+        }
+    })
+}
+'''
+
+
+def _write_file(path: str, content: str) -> None:
+    """Write generated source to path as UTF-8 in a single write call.
+
+    The content goes to a temporary file that then replaces path, so an
+    interrupted run never leaves a truncated file behind.
+    """
+    tmp_path = f"{path}.tmp"
+    Path(tmp_path).write_bytes(content.encode('utf-8'))
+    os.replace(tmp_path, path)
+
+
+def _write_if_changed(path: str, content: str) -> bool:
+    """Write path only when its content differs, leaving its mtime alone otherwise.
+
+    Keeps cargo from rebuilding the crate when an incremental run produces the
+    same support files and mod.rs again. Returns whether the file was written.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == content.encode('utf-8'):
+                return False
+    except OSError:
+        pass
+    _write_file(path, content)
+    return True
+
+
 def generate_support_files(output_dir: str) -> None:
-    """Write schema.rs and json_util.rs into output_dir."""
-    for filename, content in (('schema.rs', _SCHEMA_RS), ('json_util.rs', _JSON_UTIL_RS)):
-        path = os.path.join(output_dir, filename)
-        with open(path, 'w') as f:
-            f.write(content)
-        print(f"  + Wrote {filename}")
+    """Write schema.rs, json_util.rs and list_util.rs into output_dir."""
+    for filename, content in (('schema.rs', _SCHEMA_RS), ('json_util.rs', _JSON_UTIL_RS), ('list_util.rs', _LIST_UTIL_RS)):
+        if _write_if_changed(os.path.join(output_dir, filename), content):
+            print(f"  + Wrote {filename}")
+        else:
+            print(f"  = Unchanged {filename}")
 
 
 def generate_mod_file(output_dir: str, rust_files: List[str], cluster_info: List[Dict[str, str]]) -> None:
     """Generate a mod.rs file that includes all generated modules."""
     mod_file_path = os.path.join(output_dir, "mod.rs")
 
-    with open(mod_file_path, 'w') as f:
-        f.write("//! Matter cluster TLV encoders and decoders\n")
-        f.write("//! \n")
-        f.write("//! This file is automatically generated.\n\n")
+    parts = [
+        "//! Matter cluster TLV encoders and decoders\n",
+        "//! \n",
+        "//! This file is automatically generated.\n\n",
+        "pub mod schema;\n",
+        "pub mod json_util;\n",
+        "pub mod list_util;\n",
+        "pub use schema::{CommandField, FieldKind};\n\n",
+    ]
+
+    # Generated module declarations
+    for rust_file in sorted(rust_files):
+        parts.append(f"pub mod {generate_module_name(rust_file)};\n")
+
+    # Sorted once up front; the dispatchers' own sort is then a linear pass
+    cluster_info = sorted(cluster_info, key=lambda x: x['cluster_id'])
+
+    # Attribute dispatchers (existing)
+    parts.append("\n")
+    parts.append(generate_main_dispatcher(cluster_info))
+
+    parts.append("\n")
+    parts.append(generate_main_attribute_list_dispatcher(cluster_info))
+
+    # Command dispatchers
+    parts.append("\n")
+    parts.append(_generate_command_dispatchers(cluster_info))
+
+    # Event dispatchers
+    parts.append("\n")
+    parts.append(generate_main_event_dispatcher(cluster_info))
+    parts.append("\n")
+    parts.append(generate_main_event_list_dispatcher(cluster_info))
+
+    if _write_if_changed(mod_file_path, "".join(parts)):
+        print(f"  ✓ Generated mod.rs with {len(rust_files)} modules and dispatchers")
+    else:
+        print("  = Unchanged mod.rs")
+
 
-        f.write("pub mod schema;\n")
-        f.write("pub mod json_util;\n")
-        f.write("pub use schema::{CommandField, FieldKind};\n\n")
+def _generation_salt(global_typedefs: Dict[str, str]) -> bytes:
+    """Digest of everything besides the XML itself that shapes a cluster file.
+
+    Covers the generator sources and the cross-cluster typedefs, so the
+    content-hash cache is invalidated when either changes.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    gen_dir = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(glob.glob(os.path.join(gen_dir, '**', '*.py'), recursive=True)):
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    h.update(repr(sorted(global_typedefs.items())).encode('utf-8'))
+    return h.digest()
+
+
+def _output_digest(content: bytes) -> str:
+    """Digest of a generated file's content."""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
 
-        # Generated module declarations
-        for rust_file in sorted(rust_files):
-            module_name = generate_module_name(rust_file)
-            f.write(f"pub mod {module_name};\n")
 
-        # Attribute dispatchers (existing)
-        f.write("\n")
-        f.write(generate_main_dispatcher(cluster_info))
+def _file_digest(path: str) -> Optional[str]:
+    """Digest of the file at path as it is on disk, or None if it can't be read."""
+    try:
+        with open(path, 'rb') as f:
+            return _output_digest(f.read())
+    except OSError:
+        return None
+
 
-        f.write("\n")
-        f.write(generate_main_attribute_list_dispatcher(cluster_info))
+# Input hash, output hash and cluster info of every cluster from the previous
+# run, keyed by XML file name, stored in the output directory
+_CACHE_FILE = '.gen_cache.json'
 
-        # Command dispatchers
-        f.write("\n")
-        f.write(_generate_command_dispatchers(cluster_info))
 
-        # Event dispatchers
-        f.write("\n")
-        f.write(generate_main_event_dispatcher(cluster_info))
-        f.write("\n")
-        f.write(generate_main_event_list_dispatcher(cluster_info))
+def _valid_cache_entry(entry: object) -> bool:
+    """Check that a cache entry has the shape _process_one relies on."""
+    return (isinstance(entry, dict)
+            and isinstance(entry.get('hash'), str)
+            and isinstance(entry.get('output'), str)
+            and isinstance(entry.get('info'), dict))
 
-    print(f"  ✓ Generated mod.rs with {len(rust_files)} modules and dispatchers")
 
+def _load_cache(output_dir: str) -> Dict[str, Dict[str, object]]:
+    """Return the previous run's cache, or an empty one if it is missing or unreadable.
 
-def process_xml_files(xml_dir: str, output_dir: str) -> None:
-    """Process all XML files in the given directory."""
+    Malformed entries are dropped, so those clusters are simply regenerated.
+    """
+    try:
+        with open(os.path.join(output_dir, _CACHE_FILE)) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    return {name: entry for name, entry in cache.items() if _valid_cache_entry(entry)}
+
+
+def _process_one(xml_file: str, output_dir: str, global_typedefs: Dict[str, str], salt: bytes, cached: Optional[Dict[str, object]] = None, force: bool = False) -> Tuple[Optional[Dict[str, object]], bool, Optional[str], str, str]:
+    """Generate and write the Rust module for one cluster XML file.
+
+    Runs in a worker process. Returns (cluster info, generated, error message,
+    input hash, output hash); the cluster info is still returned when only
+    code generation fails, so the cluster keeps its place in the mod.rs
+    dispatchers. `generated` is False when `cached` (this file's entry from
+    the previous run) carries the same input hash and the .rs on disk still
+    matches its output hash; the cached cluster info is then reused and the
+    XML is not even parsed. It is also False when the regenerated code is
+    identical to the file on disk, which is then left untouched. `force`
+    regenerates the output regardless.
+    """
+    info = None
+    digest = ''
+    try:
+        xml_filename = os.path.basename(xml_file)
+        rust_filename = generate_rust_filename(xml_filename)
+
+        with open(xml_file, 'rb') as f:
+            xml_data = f.read()
+        digest = hashlib.blake2b(xml_data, digest_size=16, key=salt).hexdigest()
+        rust_path = os.path.join(output_dir, rust_filename)
+        if (not force and cached is not None and cached['hash'] == digest
+                and _file_digest(rust_path) == cached['output']):
+            return cached['info'], False, None, digest, cached['output']
+
+        # Parse XML to get cluster information; the tree is shared with (and
+        # released by) the code generator
+        tree = parse_xml_bytes(xml_data)
+        root = tree.getroot()
+
+        # Extract cluster information
+        cluster_id = get_cluster_id(root)
+        module_name = generate_module_name(rust_filename)
+
+        # Check if cluster has attributes
+        attributes = root.findall(".//attribute")
+        has_attributes = len(attributes) > 0
+
+        # Check if cluster has commandToServer commands
+        commands_elem = root.find('commands')
+        has_commands = False
+        if commands_elem is not None:
+            has_commands = any(
+                cmd.get('direction', 'commandToServer') == 'commandToServer'
+                for cmd in commands_elem.findall('command')
+            )
+
+        has_events = len(root.findall(".//event")) > 0
+
+        info = {
+            'cluster_id': cluster_id,
+            'module_name': module_name,
+            'has_attributes': has_attributes,
+            'has_commands': has_commands,
+            'has_events': has_events,
+            'xml_filename': xml_filename
+        }
+
+        code = generate_rust_code(xml_file, global_typedefs, tree)
+        written = _write_if_changed(rust_path, code)
+        return info, written, None, digest, _output_digest(code.encode('utf-8'))
+
+    except Exception as e:
+        return info, False, str(e), digest, ''
+
+
+def process_xml_files(xml_dir: str, output_dir: str, force: bool = False) -> None:
+    """Process all XML files in the given directory.
+
+    With `force`, every cluster is regenerated even if its output is up to date.
+    """
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
 
-    # Find all XML files in the directory
-    xml_pattern = os.path.join(xml_dir, "*.xml")
-    xml_files = glob.glob(xml_pattern)
+    # Find all XML files in the directory; DirEntry already carries the name,
+    # so no basename work is needed per file
+    with os.scandir(xml_dir) as it:
+        xml_entries = sorted((e for e in it
+                              if e.name.endswith('.xml') and not e.name.startswith('.') and e.is_file()),
+                             key=lambda e: e.name)
+    xml_files = [e.path for e in xml_entries]
+    xml_filenames = [e.name for e in xml_entries]
 
     if not xml_files:
         print(f"No XML files found in directory: {xml_dir}")
@@ -1422,9 +1708,9 @@ def process_xml_files(xml_dir: str, output_dir: str) -> None:
     # Build global typedef registry from all XML files (first pass)
     # so cross-cluster <number> typedefs are available during code generation.
     global_typedefs: Dict[str, str] = {}
-    for xml_file in sorted(xml_files):
+    for xml_file in xml_files:
         try:
-            local = ClusterParser(xml_file).parse_typedefs()
+            local = scan_typedefs(xml_file)
             for name, base in local.items():
                 # Resolve transitive aliases (typedef of typedef)
                 resolved = global_typedefs.get(base, base)
@@ -1437,63 +1723,41 @@ def process_xml_files(xml_dir: str, output_dir: str) -> None:
     generated_rust_files = []
     cluster_info = []
 
-    for xml_file in sorted(xml_files):
-        xml_filename = os.path.basename(xml_file)
-        rust_filename = generate_rust_filename(xml_filename)
-        output_file = os.path.join(output_dir, rust_filename)
-
-        try:
+    salt = _generation_salt(global_typedefs)
+    # Clusters are independent, so generate and write them in worker
+    # processes and report the results here in file order
+    cache = _load_cache(output_dir)
+    new_cache: Dict[str, Dict[str, object]] = {}
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = executor.map(_process_one, xml_files, repeat(output_dir),
+                               repeat(global_typedefs), repeat(salt),
+                               [cache.get(name) for name in xml_filenames],
+                               repeat(force))
+        for xml_filename, (info, generated, error, digest, output_digest) in zip(xml_filenames, results):
+            rust_filename = generate_rust_filename(xml_filename)
             print(f"Processing {xml_filename} -> {rust_filename}")
 
-            # Parse XML to get cluster information
-            tree = ET.parse(xml_file)
-            root = tree.getroot()
-
-            # Extract cluster information
-            cluster_id = get_cluster_id(root)
-            module_name = generate_module_name(rust_filename)
-
-            # Check if cluster has attributes
-            attributes = root.findall(".//attribute")
-            has_attributes = len(attributes) > 0
-
-            # Check if cluster has commandToServer commands
-            commands_elem = root.find('commands')
-            has_commands = False
-            if commands_elem is not None:
-                has_commands = any(
-                    cmd.get('direction', 'commandToServer') == 'commandToServer'
-                    for cmd in commands_elem.findall('command')
-                )
-
-            has_events = len(root.findall(".//event")) > 0
-
-            cluster_info.append({
-                'cluster_id': cluster_id,
-                'module_name': module_name,
-                'has_attributes': has_attributes,
-                'has_commands': has_commands,
-                'has_events': has_events,
-                'xml_filename': xml_filename
-            })
-
-            rust_code = generate_rust_code(xml_file, global_typedefs)
-
-            with open(output_file, 'w') as f:
-                f.write(rust_code)
+            if info is not None:
+                cluster_info.append(info)
+            if error is None:
+                new_cache[xml_filename] = {'hash': digest, 'output': output_digest, 'info': info}
+            if error is not None:
+                print(f"  ✗ Error processing {xml_filename}: {error}")
+                failed_count += 1
+                continue
 
             generated_rust_files.append(rust_filename)
             processed_count += 1
-            print(f"  ✓ Generated {rust_filename}")
-
-        except Exception as e:
-            print(f"  ✗ Error processing {xml_filename}: {e}")
-            failed_count += 1
+            if not generated:
+                print(f"  = Unchanged {rust_filename}")
+            else:
+                print(f"  ✓ Generated {rust_filename}")
 
     # Write support files and mod.rs
     if generated_rust_files:
         generate_support_files(output_dir)
         generate_mod_file(output_dir, generated_rust_files, cluster_info)
+    _write_if_changed(os.path.join(output_dir, _CACHE_FILE), json.dumps(new_cache, indent=1, sort_keys=True) + '\n')
 
     print(f"\nProcessing complete:")
     print(f"  Successfully processed: {processed_count} files")
@@ -1501,18 +1765,22 @@ def process_xml_files(xml_dir: str, output_dir: str) -> None:
     print(f"  Output directory: {output_dir}")
 
 
-def main():
+def main() -> None:
     """Main entry point."""
-    if len(sys.argv) != 3:
-        print("Usage: python generate.py <xml_directory> <output_directory>")
+    args = sys.argv[1:]
+    force = '--force' in args
+    args = [arg for arg in args if arg != '--force']
+    if len(args) != 2:
+        print("Usage: python generate.py [--force] <xml_directory> <output_directory>")
+        print("")
+        print("  --force  regenerate every cluster, even if its output is up to date")
         print("")
         print("Examples:")
         print("  python generate.py ../xml ./generated")
         print("  python generate.py /path/to/xml/files /path/to/output")
         sys.exit(1)
 
-    xml_dir = sys.argv[1]
-    output_dir = sys.argv[2]
+    xml_dir, output_dir = args
 
     if not os.path.exists(xml_dir):
         print(f"Error: XML directory '{xml_dir}' not found")
@@ -1523,7 +1791,7 @@ def main():
         sys.exit(1)
 
     try:
-        process_xml_files(xml_dir, output_dir)
+        process_xml_files(xml_dir, output_dir, force)
 
     except Exception as e:
         print(f"Error processing files: {e}")
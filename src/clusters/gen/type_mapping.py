@@ -5,7 +5,8 @@ This module provides the MatterType class which handles conversion between
 Matter specification types and their Rust/TLV equivalents.
 """
 
-from typing import Dict, TYPE_CHECKING, Optional
+import sys
+from typing import Dict, TYPE_CHECKING, Optional, Tuple
 
 if TYPE_CHECKING:
     from models.enums import MatterEnum, MatterBitmap
@@ -54,6 +55,9 @@ class MatterType:
         'bitmap32':     ('UInt32',      'u32'),
     }
 
+    # Intern the keys so lookups with interned field types hit the identity fast path
+    TYPE_MAP = {sys.intern(k): v for k, v in TYPE_MAP.items()}
+
     # Backward compatibility: old TYPE_MAPPING is now derived from TYPE_MAP
     TYPE_MAPPING = {k: v[0] for k, v in TYPE_MAP.items()}
 
@@ -68,24 +72,38 @@ class MatterType:
         'i8': 'Int8', 'i16': 'Int16', 'i32': 'Int32', 'i64': 'Int64',
     }
 
+    # Memoized lookups for types that don't depend on the cluster's enum and
+    # bitmap definitions (everything except *Bitmap for TLV types, and
+    # *Enum/*Bitmap for Rust types)
+    _TLV_TYPE_CACHE: Dict[str, str] = {}
+    _RUST_TYPE_CACHE: Dict[Tuple[str, bool], str] = {}
+
     @classmethod
     def get_tlv_type(cls, matter_type: str, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
         """Convert Matter type to TLV encoding type."""
+        tlv_type = cls._TLV_TYPE_CACHE.get(matter_type)
+        if tlv_type is not None:
+            return tlv_type
         # Handle special cases
-        if matter_type.endswith('Enum'):
-            return 'UInt8'
         if matter_type.endswith('Bitmap'):
             if bitmaps and matter_type in bitmaps:
                 base_type = bitmaps[matter_type].get_base_type()
                 # Use RUST_TO_TLV mapping instead of if/elif chain
                 return cls.RUST_TO_TLV.get(base_type, 'UInt8')
             return 'UInt8'
-
-        return cls.TYPE_MAPPING.get(matter_type, 'UInt8')
+        if matter_type.endswith('Enum'):
+            tlv_type = 'UInt8'
+        else:
+            tlv_type = cls.TYPE_MAPPING.get(matter_type, 'UInt8')
+        cls._TLV_TYPE_CACHE[matter_type] = tlv_type
+        return tlv_type
 
     @classmethod
     def get_rust_type(cls, matter_type: str, is_list: bool = False, enums: Optional[Dict[str, 'MatterEnum']] = None, bitmaps: Optional[Dict[str, 'MatterBitmap']] = None) -> str:
         """Get the corresponding Rust type for function parameters."""
+        rust_type = cls._RUST_TYPE_CACHE.get((matter_type, is_list))
+        if rust_type is not None:
+            return rust_type
         # Check if this is an enum type and we have the enum definition
         if matter_type.endswith('Enum') and enums and matter_type in enums:
             enum_obj = enums[matter_type]
@@ -103,6 +121,9 @@ class MatterType:
         else:
             # Look up Rust type from TYPE_MAP
             base_type = cls.TYPE_MAP.get(matter_type, (None, 'u8'))[1]
+            rust_type = f"Vec<{base_type}>" if is_list or matter_type == 'list' else base_type
+            cls._RUST_TYPE_CACHE[(matter_type, is_list)] = rust_type
+            return rust_type
 
         # Handle list types
         if is_list or matter_type == 'list':
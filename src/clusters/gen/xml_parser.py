@@ -5,8 +5,17 @@ This module contains the ClusterParser class that extracts information from
 Matter cluster XML files.
 """
 
-import xml.etree.ElementTree as ET
-from typing import Dict, List
+import sys
+from typing import Dict, List, Optional
+
+try:
+    from lxml import etree as ET
+    # Drop comments and processing instructions like ElementTree does, and
+    # skip xml:id indexing which the cluster files don't use
+    _XML_PARSER = ET.XMLParser(remove_comments=True, remove_pis=True, collect_ids=False)
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _XML_PARSER = None
 
 from .naming import convert_to_snake_case, escape_rust_keyword
 from .models import (
@@ -31,16 +40,28 @@ def _parse_field_element(field_elem) -> MatterField:
     field_type = field_elem.get('type', 'uint8')
     field_default = field_elem.get('default')
 
+    # Pick out the first <entry>, <quality> and <mandatoryConform> children in
+    # one pass instead of a find() per tag
+    entry_elem = quality_elem = mandatory_elem = None
+    for child in field_elem:
+        tag = child.tag
+        if tag == 'entry':
+            if entry_elem is None:
+                entry_elem = child
+        elif tag == 'quality':
+            if quality_elem is None:
+                quality_elem = child
+        elif tag == 'mandatoryConform':
+            if mandatory_elem is None:
+                mandatory_elem = child
+
     # Check for entry type (for list fields)
-    entry_elem = field_elem.find('entry')
     entry_type = entry_elem.get('type') if entry_elem is not None else None
 
     # Check if field is nullable
-    quality_elem = field_elem.find('quality')
     nullable = quality_elem.get('nullable', 'false').lower() == 'true' if quality_elem is not None else False
 
     # Check if field is mandatory
-    mandatory_elem = field_elem.find('mandatoryConform')
     mandatory = mandatory_elem is not None
 
     return MatterField(
@@ -54,12 +75,54 @@ def _parse_field_element(field_elem) -> MatterField:
     )
 
 
+def parse_xml(xml_file: str):
+    """Parse an XML file with lxml when it is installed, else with ElementTree."""
+    return ET.parse(xml_file, parser=_XML_PARSER)
+
+
+def parse_xml_bytes(data: bytes):
+    """Parse an XML document already read into memory, like parse_xml."""
+    return ET.ElementTree(ET.fromstring(data, parser=_XML_PARSER))
+
+
+def scan_typedefs(xml_file: str) -> Dict[str, str]:
+    """Stream an XML file and return its <number> typedefs (name -> base type).
+
+    Equivalent to `ClusterParser(xml_file).parse_typedefs()` but built on
+    iterparse: each top-level section is cleared as soon as it is closed, so
+    the typedef pre-pass over every cluster file never holds a whole tree.
+    """
+    typedefs: Dict[str, str] = {}
+    depth = 0
+    in_data_types = False
+    seen_data_types = False
+    for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            # Only the first <dataTypes> section is consulted, like root.find()
+            if depth == 2 and elem.tag == 'dataTypes' and not seen_data_types:
+                in_data_types = seen_data_types = True
+            continue
+
+        depth -= 1
+        if in_data_types and depth == 2 and elem.tag == 'number':
+            name = elem.get('name')
+            base = elem.get('type')
+            if name and base:
+                typedefs[name] = base
+        elif depth == 1:
+            in_data_types = False
+            elem.clear()
+    return typedefs
+
+
 class ClusterParser:
     """Parses Matter cluster XML files."""
 
-    def __init__(self, xml_file: str):
+    def __init__(self, xml_file: str, tree=None) -> None:
+        """Parse xml_file, or use `tree` if the caller has already parsed it."""
         self.xml_file = xml_file
-        self.tree = ET.parse(xml_file)
+        self.tree = tree if tree is not None else parse_xml(xml_file)
         self.root = self.tree.getroot()
         self.cluster_name = self.root.get('name', 'Unknown')
         self.cluster_id = self.root.get('id', '0x0000')
@@ -72,10 +135,16 @@ class ClusterParser:
         if commands_elem is None:
             return commands
 
-        for cmd_elem in commands_elem.findall('command'):
+        cmd_elems = commands_elem.findall('command')
+        # Name -> first <command> with that name, for *WithOnOff inheritance
+        cmd_by_name = {}
+        for cmd_elem in cmd_elems:
+            cmd_by_name.setdefault(cmd_elem.get('name'), cmd_elem)
+
+        for cmd_elem in cmd_elems:
             cmd_id = cmd_elem.get('id', '0x00')
             cmd_name = cmd_elem.get('name', 'Unknown')
-            cmd_direction = cmd_elem.get('direction', 'commandToServer')
+            cmd_direction = sys.intern(cmd_elem.get('direction', 'commandToServer'))
 
             # Only process commands to server (client-to-server)
             if cmd_direction != 'commandToServer':
@@ -98,13 +167,12 @@ class ClusterParser:
             if not command.fields and cmd_name.endswith('WithOnOff'):
                 base_name = cmd_name.replace('WithOnOff', '')
                 # Look for the base command to inherit fields
-                for base_cmd_elem in commands_elem.findall('command'):
-                    if base_cmd_elem.get('name') == base_name:
-                        # Copy fields from base command
-                        for field_elem in base_cmd_elem.findall('field'):
-                            field = _parse_field_element(field_elem)
-                            command.add_field(field)
-                        break
+                base_cmd_elem = cmd_by_name.get(base_name)
+                if base_cmd_elem is not None:
+                    # Copy fields from base command
+                    for field_elem in base_cmd_elem.findall('field'):
+                        field = _parse_field_element(field_elem)
+                        command.add_field(field)
 
             commands.append(command)
 
@@ -217,7 +285,7 @@ class ClusterParser:
             return structs
 
         for struct_elem in data_types_elem.findall('struct'):
-            struct_name = struct_elem.get('name', 'Unknown')
+            struct_name = sys.intern(struct_elem.get('name', 'Unknown'))
             struct = MatterStruct(struct_name)
 
             # Parse struct fields
@@ -238,7 +306,7 @@ class ClusterParser:
             return enums
 
         for enum_elem in data_types_elem.findall('enum'):
-            enum_name = enum_elem.get('name', 'Unknown')
+            enum_name = sys.intern(enum_elem.get('name', 'Unknown'))
             enum = MatterEnum(enum_name)
 
             # Parse enum items
@@ -249,7 +317,7 @@ class ClusterParser:
 
                 # Parse the value (can be decimal or hex)
                 try:
-                    if value_str.startswith('0x') or value_str.startswith('0X'):
+                    if value_str.startswith(('0x', '0X')):
                         value = int(value_str, 16)
                     else:
                         value = int(value_str)
@@ -262,6 +330,36 @@ class ClusterParser:
 
         return enums
 
+    def parse_facade_cluster_name(self) -> Optional[str]:
+        """Return the cluster name the typed facade is generated for, if any.
+
+        Matches defs.rs constant naming by using the <clusterIds><clusterId
+        name=...> attribute, not the root element's name attribute (which often
+        has a " Cluster" suffix). When an XML defines multiple clusters (e.g.
+        ResourceMonitoring), gen2.py only emits CLUSTER_{name}_ATTR_ID_ /
+        CMD_ID_ constants for the LAST cluster, so the facade must use the last
+        clusterId too. Abstract/base clusters (AlarmBase, ModeBase, ...) have
+        <clusterId> with no id attribute and get no defs constants - None is
+        returned for those files.
+        """
+        cluster_ids_elem = self.root.find('clusterIds')
+        if cluster_ids_elem is not None:
+            concrete_ids = [ci for ci in cluster_ids_elem.findall('clusterId') if ci.get('id')]
+            if concrete_ids:
+                return concrete_ids[-1].get('name')
+        return None
+
+    def release(self) -> None:
+        """Drop the parsed document once everything needed has been extracted.
+
+        Clears the root element so the whole tree can be freed even while the
+        caller still holds a reference to it; the parse_* methods must not be
+        called afterwards.
+        """
+        self.root.clear()
+        self.root = None
+        self.tree = None
+
     def parse_typedefs(self) -> Dict[str, str]:
         """Parse <number> typedef elements from dataTypes and return name -> base_type mapping."""
         typedefs = {}
@@ -284,7 +382,7 @@ class ClusterParser:
             return bitmaps
 
         for bitmap_elem in data_types_elem.findall('bitmap'):
-            bitmap_name = bitmap_elem.get('name', 'Unknown')
+            bitmap_name = sys.intern(bitmap_elem.get('name', 'Unknown'))
             bitmap = MatterBitmap(bitmap_name)
 
             # Parse bitfield items
@@ -300,7 +398,7 @@ class ClusterParser:
 
                 # Parse the bit position (can be decimal or hex)
                 try:
-                    if bit_str.startswith('0x') or bit_str.startswith('0X'):
+                    if bit_str.startswith(('0x', '0X')):
                         bit_pos = int(bit_str, 16)
                     else:
                         bit_pos = int(bit_str)